@@ -0,0 +1,39 @@
+import argparse
+import shutil
+import time
+
+import pygame
+
+from components.assets import registry
+from components.hud import HUD
+from components.track import Track, MAP_PATH
+from components.track_cache import TrackCache
+from game.game_config import GameConfig
+
+def main():
+    parser = argparse.ArgumentParser(description="Buduje pamięć podręczną zasobów toru w katalogu .cache.")
+    parser.add_argument("--force", action="store_true", help="usuń istniejące pliki i zbuduj je od nowa")
+    args = parser.parse_args()
+
+    if args.force:
+        shutil.rmtree(TrackCache(MAP_PATH).directory, ignore_errors=True)
+
+    pygame.font.init()
+    start = time.perf_counter()
+
+    track = Track(GameConfig.SCREEN_WIDTH, GameConfig.SCREEN_HEIGHT)
+    hud = HUD(GameConfig.SCREEN_WIDTH, GameConfig.SCREEN_HEIGHT, track.width, track.height)
+    hud.generate_minimap(track)
+
+    spawn_data = GameConfig.load_spawn_positions()
+    sprite_names = {"bolid.png"} | {ai.get("sprite", "bolid.png") for ai in spawn_data.get("ai_cars", [])}
+    for sprite_name in sorted(sprite_names):
+        registry.get_car_sprite(sprite_name)
+
+    elapsed = time.perf_counter() - start
+    built = ", ".join(track.cache.built) if track.cache.built else "brak, wszystko aktualne"
+    print(f"Pamięć podręczna toru: {track.cache.directory}")
+    print(f"Zbudowane: {built} ({elapsed:.2f}s)")
+
+if __name__ == "__main__":
+    main()
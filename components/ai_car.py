@@ -1,12 +1,17 @@
 import math
 from .car import Car
+from .racing_line import RacingLine
 
 class AICar(Car):
-    def __init__(self, x, y, waypoints, color=(0, 0, 255), ai_speed=1000, racing_line_offset=0, sprite_name="bolid.png"):
+    def __init__(self, x, y, waypoints, color=(0, 0, 255), ai_speed=1000, racing_line_offset=0, sprite_name="bolid.png",
+                 track=None):
         super().__init__(x, y, color, sprite_name)
-        self.base_waypoints = waypoints
+        self.track = track
+        self.wall_avoid_distance = 80
+        self.wall_avoid_strength = 1.5
+        self.racing_line = waypoints if isinstance(waypoints, RacingLine) else RacingLine(waypoints)
         self.racing_line_offset = racing_line_offset
-        self.waypoints = self._apply_offset_to_waypoints(waypoints, racing_line_offset)
+        self.waypoints = self.racing_line.lane(racing_line_offset)
         self.current_waypoint = 0
         self.ai_base_speed = ai_speed
         self.ai_target_speed = ai_speed
@@ -21,30 +26,6 @@ class AICar(Car):
                 effective_speed *= effect['factor']
         return effective_speed
 
-    def _apply_offset_to_waypoints(self, waypoints, offset):
-        if offset == 0:
-            return waypoints
-
-        offset_waypoints = []
-        for i, (wx, wy) in enumerate(waypoints):
-            next_i = (i + 1) % len(waypoints)
-            next_x, next_y = waypoints[next_i]
-
-            dx = next_x - wx
-            dy = next_y - wy
-            length = math.sqrt(dx * dx + dy * dy)
-
-            if length > 0:
-                perp_x = -dy / length
-                perp_y = dx / length
-                new_x = wx + perp_x * offset
-                new_y = wy + perp_y * offset
-                offset_waypoints.append((int(new_x), int(new_y)))
-            else:
-                offset_waypoints.append((wx, wy))
-
-        return offset_waypoints
-
     def update(self, dt):
         self.update_effects(dt) 
 
@@ -58,6 +39,8 @@ class AICar(Car):
         else:
             self._ai_navigate(dt)
 
+        self.prev_x = self.x
+        self.prev_y = self.y
         angle_rad = math.radians(self.angle)
         self.x += math.sin(angle_rad) * self.speed * dt
         self.y -= math.cos(angle_rad) * self.speed * dt
@@ -79,6 +62,15 @@ class AICar(Car):
             dx = target_x - self.x
             dy = target_y - self.y
 
+        if self.track is not None:
+            clearance = self.track.distance_to_wall(self.x, self.y)
+            if clearance < self.wall_avoid_distance:
+                normal_x, normal_y = self.track.wall_normal(self.x, self.y)
+                length = math.sqrt(dx * dx + dy * dy) or 1.0
+                weight = (self.wall_avoid_distance - clearance) / self.wall_avoid_distance * self.wall_avoid_strength
+                dx = dx / length + normal_x * weight
+                dy = dy / length + normal_y * weight
+
         target_angle = math.degrees(math.atan2(dx, -dy))
         angle_diff = target_angle - self.angle
 
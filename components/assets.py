@@ -0,0 +1,85 @@
+import hashlib
+import os
+import tempfile
+import pygame
+from pathlib import Path
+
+IMAGES_PATH = Path(__file__).parent.parent / "assets" / "images"
+CACHE_PATH = Path(__file__).parent.parent / ".cache"
+
+CAR_SPRITE_SCALE = 0.055
+
+def file_digest(path):
+    digest = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()[:16]
+
+def write_atomic(path, write):
+    """Calls write() on a temporary file next to path, then moves it into place.
+
+    Other processes reading the cache see either no file or a complete one.
+    """
+    path = Path(path)
+    fd, temp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.stem}.", suffix=path.suffix)
+    os.close(fd)
+    try:
+        write(temp_path)
+        os.replace(temp_path, path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+
+def prepare_surface(surface):
+    if pygame.display.get_surface() is not None:
+        return surface.convert_alpha()
+    return surface
+
+class AssetRegistry:
+    """Process-wide store of decoded sprites; returned surfaces are shared and must not be drawn on."""
+
+    def __init__(self, images_path=IMAGES_PATH, cache_path=CACHE_PATH, disk_cache=True):
+        self.images_path = Path(images_path)
+        self.cache_path = Path(cache_path) / "sprites"
+        self.disk_cache = disk_cache
+        self.sprites = {}
+
+    def get_car_sprite(self, sprite_name):
+        sprite = self.sprites.get(sprite_name)
+        if sprite is None:
+            sprite = prepare_surface(self._load_car_sprite(sprite_name))
+            self.sprites[sprite_name] = sprite
+        return sprite
+
+    def _load_car_sprite(self, sprite_name):
+        source_path = self.images_path / sprite_name
+        cached_path = None
+
+        if self.disk_cache:
+            cached_path = self.cache_path / f"{source_path.stem}_{file_digest(source_path)}_{CAR_SPRITE_SCALE}.png"
+            if cached_path.exists():
+                try:
+                    return pygame.image.load(str(cached_path))
+                except pygame.error:
+                    pass
+
+        loaded_sprite = pygame.image.load(str(source_path))
+        new_width = int(loaded_sprite.get_width() * CAR_SPRITE_SCALE)
+        new_height = int(loaded_sprite.get_height() * CAR_SPRITE_SCALE)
+        scaled_sprite = pygame.transform.scale(loaded_sprite, (new_width, new_height))
+        sprite = pygame.transform.rotate(scaled_sprite, 180)
+
+        if cached_path is not None:
+            try:
+                cached_path.parent.mkdir(parents=True, exist_ok=True)
+                write_atomic(cached_path, lambda temp_path: pygame.image.save(sprite, temp_path))
+            except (OSError, pygame.error):
+                pass
+
+        return sprite
+
+    def clear(self):
+        self.sprites = {}
+
+registry = AssetRegistry()
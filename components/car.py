@@ -1,21 +1,20 @@
 import pygame
 import math
-from pathlib import Path
+
+from .assets import registry
+from .sprite_cache import rotation_cache
 
 class Car:
     def __init__(self, x, y, color=(255, 0, 0), sprite_name="bolid.png"):
         self.x = x
         self.y = y
+        self.prev_x = x
+        self.prev_y = y
+        self.previous_pose = None
         self.color = color
+        self.sprite_name = sprite_name
 
-        sprite_path = Path(__file__).parent.parent / "assets" / "images" / sprite_name
-        loaded_sprite = pygame.image.load(str(sprite_path)).convert_alpha()
-
-        scale_factor = 0.055
-        new_width = int(loaded_sprite.get_width() * scale_factor)
-        new_height = int(loaded_sprite.get_height() * scale_factor)
-        scaled_sprite = pygame.transform.scale(loaded_sprite, (new_width, new_height))
-        self.original_sprite = pygame.transform.rotate(scaled_sprite, 180)
+        self.original_sprite = registry.get_car_sprite(sprite_name)
 
         self.width = self.original_sprite.get_width()
         self.height = self.original_sprite.get_height()
@@ -90,16 +89,32 @@ class Car:
                 self.stun_timer = 0
                 self.speed = 0
 
+        self.prev_x = self.x
+        self.prev_y = self.y
         angle_rad = math.radians(self.angle)
         self.x += math.sin(angle_rad) * self.speed * dt
         self.y -= math.cos(angle_rad) * self.speed * dt
 
-    def draw(self, surface, camera_x=0, camera_y=0):
-        rotated_car = pygame.transform.rotate(self.original_sprite, -self.angle)
-        screen_x = self.x - camera_x
-        screen_y = self.y - camera_y
+    def store_pose(self):
+        self.previous_pose = (self.x, self.y, self.angle)
+
+    def interpolated_pose(self, alpha):
+        if self.previous_pose is None or alpha >= 1.0:
+            return self.x, self.y, self.angle
+
+        prev_x, prev_y, prev_angle = self.previous_pose
+        turn = (self.angle - prev_angle + 180) % 360 - 180
+        return (prev_x + (self.x - prev_x) * alpha,
+                prev_y + (self.y - prev_y) * alpha,
+                prev_angle + turn * alpha)
+
+    def draw(self, surface, camera_x=0, camera_y=0, alpha=1.0):
+        x, y, angle = self.interpolated_pose(alpha)
+        rotated_car = rotation_cache.get(self.sprite_name, self.original_sprite, angle)
+        screen_x = x - camera_x
+        screen_y = y - camera_y
         rotated_rect = rotated_car.get_rect(center=(screen_x, screen_y))
-        surface.blit(rotated_car, rotated_rect.topleft)
+        return surface.blit(rotated_car, rotated_rect.topleft)
 
     def get_rect(self):
         return pygame.Rect(self.x - self.width // 2, self.y - self.height // 2,
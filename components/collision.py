@@ -1,4 +1,5 @@
 import math
+import random
 import pygame
 
 def check_collision(car, track):
@@ -10,20 +11,19 @@ def handle_collision(car, track):
 def check_car_collision(car1, car2):
     dx = car1.x - car2.x
     dy = car1.y - car2.y
-    distance = math.sqrt(dx * dx + dy * dy)
     radius1 = min(car1.width, car1.height) / 3
     radius2 = min(car2.width, car2.height) / 3
-    return distance < (radius1 + radius2)
+    radius_sum = radius1 + radius2
+    return dx * dx + dy * dy < radius_sum * radius_sum
 
-def handle_car_collision(car1, car2):
-    import random
+def handle_car_collision(car1, car2, rng=random):
     dx = car1.x - car2.x
     dy = car1.y - car2.y
     distance = math.sqrt(dx * dx + dy * dy)
 
     if distance == 0:
-        dx = random.uniform(-1, 1)
-        dy = random.uniform(-1, 1)
+        dx = rng.uniform(-1, 1)
+        dy = rng.uniform(-1, 1)
         distance = math.sqrt(dx * dx + dy * dy)
 
     nx = dx / distance
@@ -0,0 +1,44 @@
+import numpy as np
+
+def _column_distance(blocked, cap):
+    height = blocked.shape[0]
+    distance = np.empty(blocked.shape, dtype=np.float32)
+
+    previous = np.full(blocked.shape[1], cap, dtype=np.float32)
+    for y in range(height):
+        previous = np.where(blocked[y], 0.0, np.minimum(previous + 1.0, cap))
+        distance[y] = previous
+
+    previous = np.full(blocked.shape[1], cap, dtype=np.float32)
+    for y in range(height - 1, -1, -1):
+        previous = np.where(blocked[y], 0.0, np.minimum(previous + 1.0, cap))
+        np.minimum(distance[y], previous, out=distance[y])
+
+    return distance
+
+def distance_transform(blocked, cap):
+    """Euclidean distance in cells from every cell to the nearest blocked cell, capped at cap.
+
+    Separable: a vertical 1D pass, then a horizontal pass that only has to
+    look cap cells to each side, which keeps the result exact below the cap.
+    """
+    cap = int(cap)
+    column = _column_distance(blocked, cap)
+    column_sq = column * column
+
+    height, width = blocked.shape
+    padded = np.full((height, width + 2 * cap), float(cap * cap), dtype=np.float32)
+    padded[:, cap:cap + width] = column_sq
+
+    best = column_sq.copy()
+    for offset in range(1, cap + 1):
+        shift_sq = float(offset * offset)
+        np.minimum(best, padded[:, cap - offset:cap - offset + width] + shift_sq, out=best)
+        np.minimum(best, padded[:, cap + offset:cap + offset + width] + shift_sq, out=best)
+
+    return np.minimum(np.sqrt(best), cap)
+
+def build_signed_distance_field(drivable, cap):
+    inside = distance_transform(~drivable, cap)
+    outside = distance_transform(drivable, cap)
+    return np.where(drivable, inside - 0.5, 0.5 - outside).astype(np.float32)
@@ -1,102 +1,143 @@
 import pygame
-import math
-import random
-
-class Particle:
-    def __init__(self, x, y, vx, vy, size, color, lifetime):
-        self.x = x
-        self.y = y
-        self.vx = vx
-        self.vy = vy
-        self.size = size
-        self.initial_size = size
-        self.color = color
-        self.lifetime = lifetime
-        self.max_lifetime = lifetime
-        self.alive = True
+import numpy as np
+
+class ParticleSprites:
+    """Pre-rendered grey circle sprites for every quantized colour, size and alpha."""
+
+    def __init__(self, max_size=18, color_levels=16, alpha_levels=16):
+        self.max_size = max_size
+        self.color_levels = color_levels
+        self.alpha_levels = alpha_levels
+        self.sprites = []
+
+        for color_level in range(color_levels):
+            value = min(255, color_level * 256 // color_levels + 256 // color_levels // 2)
+            for size in range(1, max_size + 1):
+                for alpha_level in range(alpha_levels):
+                    alpha = alpha_level * 255 // (alpha_levels - 1)
+                    sprite = pygame.Surface((size * 2, size * 2), pygame.SRCALPHA)
+                    pygame.draw.circle(sprite, (value, value, value, alpha), (size, size), size)
+                    self.sprites.append(sprite)
+
+    def indices(self, color_values, sizes, alphas):
+        color_level = color_values * self.color_levels // 256
+        alpha_level = (alphas * (self.alpha_levels - 1) + 127) // 255
+        size = np.clip(sizes, 1, self.max_size)
+        return (color_level * self.max_size + size - 1) * self.alpha_levels + alpha_level
+
+class ParticlePool:
+    """Fixed-capacity, array-backed particles; when full, the oldest particle is overwritten."""
+
+    def __init__(self, capacity=1024, damping=0.95):
+        self.capacity = capacity
+        self.damping = damping
+
+        self.x = np.zeros(capacity)
+        self.y = np.zeros(capacity)
+        self.vx = np.zeros(capacity)
+        self.vy = np.zeros(capacity)
+        self.initial_size = np.zeros(capacity, dtype=np.int32)
+        self.color_value = np.zeros(capacity, dtype=np.int32)
+        self.lifetime = np.zeros(capacity)
+        self.max_lifetime = np.ones(capacity)
+        self.alive = np.zeros(capacity, dtype=bool)
+
+        self.cursor = 0
+        self.evicted = 0
+
+    def emit(self, x, y, vx, vy, sizes, color_values, lifetimes):
+        count = min(len(vx), self.capacity)
+        slots = (self.cursor + np.arange(count)) % self.capacity
+        self.cursor = (self.cursor + count) % self.capacity
+        self.evicted += int(np.count_nonzero(self.alive[slots]))
+
+        self.x[slots] = x
+        self.y[slots] = y
+        self.vx[slots] = vx[:count]
+        self.vy[slots] = vy[:count]
+        self.initial_size[slots] = sizes[:count]
+        self.color_value[slots] = color_values[:count]
+        self.lifetime[slots] = lifetimes[:count]
+        self.max_lifetime[slots] = lifetimes[:count]
+        self.alive[slots] = True
 
     def update(self, dt):
-        self.x += self.vx * dt
-        self.y += self.vy * dt
-        self.vx *= 0.95
-        self.vy *= 0.95
-        self.lifetime -= dt
-        if self.lifetime <= 0:
-            self.alive = False
-
-    def draw(self, surface, camera_x=0, camera_y=0):
-        if not self.alive:
+        alive = self.alive
+        if not alive.any():
             return
 
-        screen_x = int(self.x - camera_x)
-        screen_y = int(self.y - camera_y)
-        life_ratio = self.lifetime / self.max_lifetime
-        alpha = int(255 * life_ratio)
-        current_size = int(self.initial_size * life_ratio)
-        if current_size < 1:
-            current_size = 1
-
-        particle_surf = pygame.Surface((current_size * 2, current_size * 2), pygame.SRCALPHA)
-        color_with_alpha = (*self.color, alpha)
-        pygame.draw.circle(particle_surf, color_with_alpha, (current_size, current_size), current_size)
-        surface.blit(particle_surf, (screen_x - current_size, screen_y - current_size))
-
-class CollisionEffect:
-    def __init__(self, x, y, num_particles=15):
-        self.particles = []
-        self.alive = True
-
-        for i in range(num_particles):
-            angle = random.uniform(0, 2 * math.pi)
-            speed = random.uniform(100, 250)
-            vx = math.cos(angle) * speed
-            vy = math.sin(angle) * speed
-            size = random.randint(4, 10)
-            color_value = random.randint(200, 255)
-            color = (color_value, color_value, color_value)
-            lifetime = random.uniform(0.3, 0.6)
-            particle = Particle(x, y, vx, vy, size, color, lifetime)
-            self.particles.append(particle)
-
-        for i in range(5):
-            angle = random.uniform(0, 2 * math.pi)
-            speed = random.uniform(50, 100)
-            vx = math.cos(angle) * speed
-            vy = math.sin(angle) * speed
-            size = random.randint(12, 18)
-            color_value = random.randint(150, 200)
-            color = (color_value, color_value, color_value)
-            lifetime = random.uniform(0.5, 0.8)
-            particle = Particle(x, y, vx, vy, size, color, lifetime)
-            self.particles.append(particle)
+        self.x[alive] += self.vx[alive] * dt
+        self.y[alive] += self.vy[alive] * dt
+        self.vx[alive] *= self.damping
+        self.vy[alive] *= self.damping
+        self.lifetime[alive] -= dt
+        alive &= self.lifetime > 0
 
-    def update(self, dt):
-        for particle in self.particles:
-            particle.update(dt)
-        self.particles = [p for p in self.particles if p.alive]
-        if len(self.particles) == 0:
-            self.alive = False
+    def count(self):
+        return int(np.count_nonzero(self.alive))
 
-    def draw(self, surface, camera_x=0, camera_y=0):
-        for particle in self.particles:
-            particle.draw(surface, camera_x, camera_y)
+    def clear(self):
+        self.alive[:] = False
+        self.cursor = 0
 
 class EffectManager:
-    def __init__(self):
-        self.effects = []
+    def __init__(self, capacity=1024):
+        self.pool = ParticlePool(capacity)
+        self.sprites = ParticleSprites()
+        self.rng = np.random.default_rng()
 
     def add_collision_effect(self, x, y, num_particles=15):
-        effect = CollisionEffect(x, y, num_particles)
-        self.effects.append(effect)
+        self._emit_burst(x, y, num_particles, (100, 250), (4, 10), (200, 255), (0.3, 0.6))
+        self._emit_burst(x, y, 5, (50, 100), (12, 18), (150, 200), (0.5, 0.8))
+
+    def _emit_burst(self, x, y, count, speed_range, size_range, color_range, lifetime_range):
+        rng = self.rng
+        angle = rng.uniform(0, 2 * np.pi, count)
+        speed = rng.uniform(*speed_range, count)
+        self.pool.emit(
+            x, y,
+            np.cos(angle) * speed,
+            np.sin(angle) * speed,
+            rng.integers(size_range[0], size_range[1] + 1, count),
+            rng.integers(color_range[0], color_range[1] + 1, count),
+            rng.uniform(*lifetime_range, count)
+        )
 
     def update(self, dt):
-        for effect in self.effects:
-            effect.update(dt)
-        self.effects = [e for e in self.effects if e.alive]
+        self.pool.update(dt)
+
+    def snapshot(self):
+        pool = self.pool
+        live = np.flatnonzero(pool.alive)
+        if len(live) == 0:
+            return None
+
+        life_ratio = pool.lifetime[live] / pool.max_lifetime[live]
+        alphas = (255 * life_ratio).astype(np.int32)
+        sizes = np.maximum(1, (pool.initial_size[live] * life_ratio).astype(np.int32))
+        sprite_indices = self.sprites.indices(pool.color_value[live], sizes, alphas)
+        return sprite_indices, pool.x[live], pool.y[live], sizes
+
+    def draw(self, surface, camera_x=0, camera_y=0, particles=None):
+        if particles is None:
+            particles = self.snapshot()
+            if particles is None:
+                return None
+
+        sprite_indices, xs, ys, sizes = particles
+        screen_x = (xs - camera_x).astype(np.int32) - sizes
+        screen_y = (ys - camera_y).astype(np.int32) - sizes
+
+        sprites = self.sprites.sprites
+        surface.blits([(sprites[index], (sx, sy)) for index, sx, sy in
+                       zip(sprite_indices.tolist(), screen_x.tolist(), screen_y.tolist())],
+                      doreturn=False)
 
-    def draw(self, surface, camera_x=0, camera_y=0):
-        for effect in self.effects:
-            effect.draw(surface, camera_x, camera_y)
+        left = int(screen_x.min())
+        top = int(screen_y.min())
+        extent = sizes * 2
+        return pygame.Rect(left, top, int((screen_x + extent).max()) - left,
+                           int((screen_y + extent).max()) - top).clip(surface.get_rect())
 
     def clear(self):
-        self.effects = []
\ No newline at end of file
+        self.pool.clear()
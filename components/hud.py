@@ -1,5 +1,6 @@
 import pygame
 import math
+import numpy as np
 
 class HUD:
     def __init__(self, screen_width, screen_height, track_width, track_height):
@@ -15,6 +16,12 @@ class HUD:
         self.minimap_scale = min(self.minimap_width / track_width, self.minimap_height / track_height)
 
         self.minimap_surface = None
+        self.minimap_layer = None
+        self.minimap_marker_radius = 4
+        self._marker_sprites = {}
+        self._minimap_markers = []
+        self._minimap_marker_rects = []
+        self._minimap_redraw = True
         self.minimap_border_color = (255, 255, 255)
         self.minimap_bg_color = (20, 20, 20, 200)
 
@@ -25,172 +32,297 @@ class HUD:
         self.speedo_border_color = (100, 100, 100)
         self.speedo_needle_color = (255, 50, 50)
         self.speedo_text_color = (255, 255, 255)
+        self.speedo_arc_step = 2
 
         self.font_large = pygame.font.Font(None, 48)
         self.font_medium = pygame.font.Font(None, 32)
         self.font_small = pygame.font.Font(None, 24)
 
+        self.effect_styles = {
+            'boost': ((50, 100, 50, 220), (0, 255, 0), "SPEED BOOST"),
+            'slow': ((100, 50, 50, 220), (255, 100, 0), "SLOWED"),
+            None: ((50, 50, 50, 220), (150, 150, 150), "EFFECT")
+        }
+
+        self.unit_label = self.font_small.render("km/h", True, (180, 180, 180))
+        self.reverse_label = self.font_small.render("R", True, (255, 50, 50))
+        self.lap_label = self.font_small.render("Okrążenie:", True, (180, 180, 180))
+        self.time_label = self.font_small.render("Czas", True, (180, 180, 180))
+        self.best_label = self.font_small.render("Best", True, (180, 180, 180))
+        self.position_label = self.font_small.render("Pozycja:", True, (180, 180, 180))
+
+        self.lap_panel = self._build_panel(150, 60, (30, 30, 30, 220), (100, 100, 100))
+        self.timer_panel = self._build_panel(220, 80, (30, 30, 30, 220), (100, 100, 100))
+        self.position_panel = self._build_panel(220, 60, (30, 30, 30, 220), (100, 100, 100))
+        self.effect_panels = {}
+        self.effect_labels = {}
+        for effect_type, (fill_color, border_color, effect_name) in self.effect_styles.items():
+            self.effect_panels[effect_type] = self._build_panel(180, 45, fill_color, border_color)
+            self.effect_labels[effect_type] = self.font_small.render(effect_name, True, (255, 255, 255))
+
+        self._fields = {}
+        self._drawn = {}
+        self._speedometer_key = None
+        self._speedometer_base = self._build_speedometer_base()
+        self._speedometer_surface = self._speedometer_base.copy()
+
+    def _build_panel(self, width, height, fill_color, border_color):
+        panel = pygame.Surface((width, height), pygame.SRCALPHA)
+        panel.fill(fill_color)
+        pygame.draw.rect(panel, border_color, (0, 0, width, height), 2)
+        return panel
+
+    def _field(self, name, font, text, color):
+        cached = self._fields.get(name)
+        if cached is not None and cached[0] == text and cached[1] == color:
+            return cached[2]
+
+        rendered = font.render(text, True, color)
+        self._fields[name] = (text, color, rendered)
+        return rendered
+
+    def _changed(self, name, key, rect):
+        previous = self._drawn.get(name)
+        if previous is not None and previous[0] == key:
+            return []
+        self._drawn[name] = (key, rect)
+        return [rect] if previous is None else [previous[1], rect]
+
+    @staticmethod
+    def _format_time(value):
+        minutes = int(value // 60)
+        seconds = int(value % 60)
+        milliseconds = int((value % 1) * 1000)
+        return f"{minutes:02d}:{seconds:02d}.{milliseconds:03d}"
+
     def generate_minimap(self, track):
-        minimap_img = pygame.transform.scale(track.map_image,
+        minimap_img = track.get_minimap_image(
             (int(self.track_width * self.minimap_scale), int(self.track_height * self.minimap_scale)))
 
         self.minimap_surface = pygame.Surface((self.minimap_width, self.minimap_height), pygame.SRCALPHA)
         self.minimap_surface.fill(self.minimap_bg_color)
         img_rect = minimap_img.get_rect(center=(self.minimap_width // 2, self.minimap_height // 2))
         self.minimap_surface.blit(minimap_img, img_rect)
-
-    def draw_minimap(self, surface, player_car, ai_cars):
-        if self.minimap_surface is None:
-            return
-
-        surface.blit(self.minimap_surface, (self.minimap_x, self.minimap_y))
-        pygame.draw.rect(surface, self.minimap_border_color,
-            (self.minimap_x, self.minimap_y, self.minimap_width, self.minimap_height), 2)
-
+        pygame.draw.rect(self.minimap_surface, self.minimap_border_color,
+            (0, 0, self.minimap_width, self.minimap_height), 2)
+
+        self.minimap_layer = self.minimap_surface.copy()
+        self._minimap_markers = []
+        self._minimap_marker_rects = []
+        self._minimap_redraw = True
+
+    def _marker_sprite(self, color):
+        sprite = self._marker_sprites.get(color)
+        if sprite is None:
+            radius = self.minimap_marker_radius
+            sprite = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
+            pygame.draw.circle(sprite, color, (radius, radius), radius)
+            self._marker_sprites[color] = sprite
+        return sprite
+
+    def _to_minimap(self, xs, ys):
         center_offset_x = (self.minimap_width - self.track_width * self.minimap_scale) / 2
         center_offset_y = (self.minimap_height - self.track_height * self.minimap_scale) / 2
+        return (center_offset_x + np.asarray(xs, dtype=float) * self.minimap_scale,
+                center_offset_y + np.asarray(ys, dtype=float) * self.minimap_scale)
 
-        for ai_car in ai_cars:
-            minimap_car_x = self.minimap_x + center_offset_x + ai_car.x * self.minimap_scale
-            minimap_car_y = self.minimap_y + center_offset_y + ai_car.y * self.minimap_scale
-            pygame.draw.circle(surface, ai_car.color, (int(minimap_car_x), int(minimap_car_y)), 4)
-
-        minimap_player_x = self.minimap_x + center_offset_x + player_car.x * self.minimap_scale
-        minimap_player_y = self.minimap_y + center_offset_y + player_car.y * self.minimap_scale
-
-        angle_rad = math.radians(player_car.angle)
+    def _player_triangle(self, x, y, angle):
+        angle_rad = math.radians(angle)
         triangle_size = 6
 
-        point1_x = minimap_player_x + math.sin(angle_rad) * triangle_size
-        point1_y = minimap_player_y - math.cos(angle_rad) * triangle_size
-        point2_x = minimap_player_x + math.sin(angle_rad + 2.5) * triangle_size * 0.6
-        point2_y = minimap_player_y - math.cos(angle_rad + 2.5) * triangle_size * 0.6
-        point3_x = minimap_player_x + math.sin(angle_rad - 2.5) * triangle_size * 0.6
-        point3_y = minimap_player_y - math.cos(angle_rad - 2.5) * triangle_size * 0.6
+        point1_x = x + math.sin(angle_rad) * triangle_size
+        point1_y = y - math.cos(angle_rad) * triangle_size
+        point2_x = x + math.sin(angle_rad + 2.5) * triangle_size * 0.6
+        point2_y = y - math.cos(angle_rad + 2.5) * triangle_size * 0.6
+        point3_x = x + math.sin(angle_rad - 2.5) * triangle_size * 0.6
+        point3_y = y - math.cos(angle_rad - 2.5) * triangle_size * 0.6
+        return [(point1_x, point1_y), (point2_x, point2_y), (point3_x, point3_y)]
+
+    def _marker_bounds(self, marker):
+        if marker[0] == 'car':
+            size = self.minimap_marker_radius * 2
+            return pygame.Rect(marker[2], marker[3], size, size)
+        xs = [point[0] for point in marker[1]]
+        ys = [point[1] for point in marker[1]]
+        return pygame.Rect(min(xs) - 2, min(ys) - 2, max(xs) - min(xs) + 5, max(ys) - min(ys) + 5)
+
+    def _draw_marker(self, marker, triangle):
+        layer = self.minimap_layer
+        if marker[0] == 'car':
+            return layer.blit(self._marker_sprite(marker[1]), (marker[2], marker[3]))
+        pygame.draw.polygon(layer, (255, 255, 0), triangle)
+        return pygame.draw.polygon(layer, (255, 255, 255), triangle, 2)
+
+    def _update_minimap_layer(self, markers, triangle):
+        layer = self.minimap_layer
+        previous = self._minimap_markers
+
+        if not self._minimap_redraw and len(previous) == len(markers):
+            changed = [i for i, (marker, old) in enumerate(zip(markers, previous)) if marker != old]
+            if not changed:
+                return []
+
+            changed_set = set(changed)
+            dirty = [self._minimap_marker_rects[i] for i in changed]
+            touched = dirty + [self._marker_bounds(markers[i]) for i in changed]
+            untouched = [rect for i, rect in enumerate(self._minimap_marker_rects) if i not in changed_set]
+
+            if not any(rect.collidelist(touched) != -1 for rect in untouched):
+                for rect in dirty:
+                    layer.fill((0, 0, 0, 0), rect)
+                    layer.blit(self.minimap_surface, rect, rect)
+                for i in changed:
+                    self._minimap_marker_rects[i] = self._draw_marker(markers[i], triangle)
+                self._minimap_markers = markers
+                return dirty + [self._minimap_marker_rects[i] for i in changed]
+
+        layer.fill((0, 0, 0, 0))
+        layer.blit(self.minimap_surface, (0, 0))
+        self._minimap_marker_rects = [self._draw_marker(marker, triangle) for marker in markers]
+        self._minimap_markers = markers
+        self._minimap_redraw = False
+        return [layer.get_rect()]
 
-        pygame.draw.polygon(surface, (255, 255, 0), [(point1_x, point1_y), (point2_x, point2_y), (point3_x, point3_y)])
-        pygame.draw.polygon(surface, (255, 255, 255), [(point1_x, point1_y), (point2_x, point2_y), (point3_x, point3_y)], 2)
+    def draw_minimap(self, surface, player_car, ai_cars):
+        if self.minimap_surface is None:
+            return []
+
+        xs, ys = self._to_minimap([car.x for car in ai_cars] + [player_car.x],
+                                  [car.y for car in ai_cars] + [player_car.y])
+        radius = self.minimap_marker_radius
+        marker_xs = (xs[:-1].astype(int) - radius).tolist()
+        marker_ys = (ys[:-1].astype(int) - radius).tolist()
+        markers = [('car', car.color, x, y) for car, x, y in zip(ai_cars, marker_xs, marker_ys)]
+
+        triangle = self._player_triangle(float(xs[-1]), float(ys[-1]), player_car.angle)
+        markers.append(('player', tuple((int(x), int(y)) for x, y in triangle)))
+
+        dirty = self._update_minimap_layer(markers, triangle)
+        surface.blit(self.minimap_layer, (self.minimap_x, self.minimap_y))
+        return [rect.move(self.minimap_x, self.minimap_y) for rect in dirty]
+
+    def _build_speedometer_base(self):
+        radius = self.speedo_radius
+        dial = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
+        pygame.draw.circle(dial, self.speedo_bg_color[:3], (radius, radius), radius)
+        pygame.draw.circle(dial, self.speedo_border_color, (radius, radius), radius, 3)
+        pygame.draw.arc(dial, (60, 60, 60), (10, 10, (radius - 10) * 2, (radius - 10) * 2),
+            math.radians(-45), math.radians(225), 8)
+        return dial
+
+    @staticmethod
+    def _speed_band(speed_percent):
+        if speed_percent < 0.5:
+            return 0
+        if speed_percent < 0.8:
+            return 1
+        return 2
+
+    def _update_speedometer(self, arc_degrees, band):
+        radius = self.speedo_radius
+        dial = self._speedometer_surface
+        dial.fill((0, 0, 0, 0))
+        dial.blit(self._speedometer_base, (0, 0))
+
+        if arc_degrees > 0:
+            start_angle = 225
+            arc_color = ((0, 255, 0), (255, 255, 0), (255, 100, 0))[band]
+            pygame.draw.arc(dial, arc_color, (10, 10, (radius - 10) * 2, (radius - 10) * 2),
+                math.radians(start_angle - arc_degrees), math.radians(start_angle), 8)
 
     def draw_speedometer(self, surface, speed, max_speed):
-        pygame.draw.circle(surface, self.speedo_bg_color, (self.speedo_x, self.speedo_y), self.speedo_radius)
-        pygame.draw.circle(surface, self.speedo_border_color, (self.speedo_x, self.speedo_y), self.speedo_radius, 3)
-
-        start_angle = 225
-        end_angle = -45
+        speed_value = int(abs(speed))
         speed_percent = min(abs(speed) / max_speed, 1.0)
+        step = self.speedo_arc_step
+        key = (round(speed_percent * 270 / step) * step, self._speed_band(speed_percent))
+        if key != self._speedometer_key:
+            self._speedometer_key = key
+            self._update_speedometer(*key)
 
-        pygame.draw.arc(surface, (60, 60, 60),
-            (self.speedo_x - self.speedo_radius + 10, self.speedo_y - self.speedo_radius + 10,
-             (self.speedo_radius - 10) * 2, (self.speedo_radius - 10) * 2),
-            math.radians(end_angle), math.radians(start_angle), 8)
+        dial_rect = surface.blit(self._speedometer_surface,
+                                 (self.speedo_x - self.speedo_radius, self.speedo_y - self.speedo_radius))
 
-        if speed_percent < 0.5:
-            arc_color = (0, 255, 0)
-        elif speed_percent < 0.8:
-            arc_color = (255, 255, 0)
-        else:
-            arc_color = (255, 100, 0)
-
-        arc_span = 270
-        current_arc_angle = start_angle - (arc_span * speed_percent)
-
-        if speed_percent > 0:
-            pygame.draw.arc(surface, arc_color,
-                (self.speedo_x - self.speedo_radius + 10, self.speedo_y - self.speedo_radius + 10,
-                 (self.speedo_radius - 10) * 2, (self.speedo_radius - 10) * 2),
-                math.radians(current_arc_angle), math.radians(start_angle), 8)
-
-        speed_text = self.font_large.render(str(int(abs(speed))), True, self.speedo_text_color)
+        speed_text = self._field("speed", self.font_large, str(speed_value), self.speedo_text_color)
         speed_rect = speed_text.get_rect(center=(self.speedo_x, self.speedo_y - 10))
         surface.blit(speed_text, speed_rect)
 
-        unit_text = self.font_small.render("km/h", True, (180, 180, 180))
-        unit_rect = unit_text.get_rect(center=(self.speedo_x, self.speedo_y + 20))
-        surface.blit(unit_text, unit_rect)
+        unit_rect = self.unit_label.get_rect(center=(self.speedo_x, self.speedo_y + 20))
+        surface.blit(self.unit_label, unit_rect)
 
         if speed < 0:
-            reverse_text = self.font_small.render("R", True, (255, 50, 50))
-            reverse_rect = reverse_text.get_rect(center=(self.speedo_x, self.speedo_y - 40))
-            surface.blit(reverse_text, reverse_rect)
+            reverse_rect = self.reverse_label.get_rect(center=(self.speedo_x, self.speedo_y - 40))
+            surface.blit(self.reverse_label, reverse_rect)
+
+        return self._changed("speedometer", (key, speed_value, speed < 0), dial_rect)
 
     def draw_lap_counter(self, surface, laps):
         x, y = 20, 20
-        panel_width, panel_height = 150, 60
-        panel_surface = pygame.Surface((panel_width, panel_height), pygame.SRCALPHA)
-        panel_surface.fill((30, 30, 30, 220))
-        surface.blit(panel_surface, (x, y))
-
-        pygame.draw.rect(surface, (100, 100, 100), (x, y, panel_width, panel_height), 2)
+        panel_rect = surface.blit(self.lap_panel, (x, y))
+        surface.blit(self.lap_label, (x + 10, y + 8))
 
-        lap_label = self.font_small.render("Okrążenie:", True, (180, 180, 180))
-        surface.blit(lap_label, (x + 10, y + 8))
-
-        lap_number = self.font_large.render(str(laps), True, (255, 255, 255))
+        lap_number = self._field("laps", self.font_large, str(laps), (255, 255, 255))
         surface.blit(lap_number, (x + 10, y + 25))
+        return self._changed("laps", laps, panel_rect)
 
     def draw_lap_timer(self, surface, current_time, best_time):
         x, y = 20, 90
-        panel_width, panel_height = 220, 80
-        panel_surface = pygame.Surface((panel_width, panel_height), pygame.SRCALPHA)
-        panel_surface.fill((30, 30, 30, 220))
-        surface.blit(panel_surface, (x, y))
+        panel_rect = surface.blit(self.timer_panel, (x, y))
+        surface.blit(self.time_label, (x + 10, y + 8))
 
-        pygame.draw.rect(surface, (100, 100, 100), (x, y, panel_width, panel_height), 2)
+        current_text = self._format_time(current_time)
+        current_time_text = self._field("current_time", self.font_medium, current_text, (255, 255, 255))
+        surface.blit(current_time_text, (x + 10, y + 28))
 
-        current_label = self.font_small.render("Czas", True, (180, 180, 180))
-        surface.blit(current_label, (x + 10, y + 8))
+        best_text = None
+        if best_time is not None:
+            surface.blit(self.best_label, (x + 10, y + 55))
 
-        minutes = int(current_time // 60)
-        seconds = int(current_time % 60)
-        milliseconds = int((current_time % 1) * 1000)
-        time_str = f"{minutes:02d}:{seconds:02d}.{milliseconds:03d}"
+            best_text = self._format_time(best_time)
+            best_time_text = self._field("best_time", self.font_small, best_text, (255, 215, 0))
+            surface.blit(best_time_text, (x + 65, y + 55))
 
-        current_time_text = self.font_medium.render(time_str, True, (255, 255, 255))
-        surface.blit(current_time_text, (x + 10, y + 28))
+        return self._changed("timer", (current_text, best_text), panel_rect)
 
-        if best_time is not None:
-            best_label = self.font_small.render("Best", True, (180, 180, 180))
-            surface.blit(best_label, (x + 10, y + 55))
+    def draw_position(self, surface, player_car, standings):
+        entry = None
+        if standings:
+            entry = next((entry for entry in standings if entry['car'] is player_car), None)
+        if entry is None:
+            return self._changed("position", None, pygame.Rect(0, 0, 0, 0))
 
-            best_minutes = int(best_time // 60)
-            best_seconds = int(best_time % 60)
-            best_milliseconds = int((best_time % 1) * 1000)
-            best_time_str = f"{best_minutes:02d}:{best_seconds:02d}.{best_milliseconds:03d}"
+        x, y = 20, 180
+        panel_rect = surface.blit(self.position_panel, (x, y))
+        surface.blit(self.position_label, (x + 10, y + 8))
 
-            best_time_text = self.font_small.render(best_time_str, True, (255, 215, 0))
-            surface.blit(best_time_text, (x + 65, y + 55))
+        position = f"{entry['position']}/{len(standings)}"
+        position_text = self._field("position", self.font_large, position, (255, 255, 255))
+        surface.blit(position_text, (x + 10, y + 25))
 
-    def draw_active_effects(self, surface, car):
-        if not hasattr(car, 'active_effects') or not car.active_effects:
-            return
+        gap = None
+        if entry['position'] > 1 and entry['gap'] is not None:
+            gap = f"+{entry['gap']:.1f}s"
+            gap_text = self._field("gap", self.font_medium, gap, (255, 100, 0))
+            surface.blit(gap_text, (x + 110, y + 30))
+
+        return self._changed("position", (position, gap), panel_rect)
 
+    def draw_active_effects(self, surface, car):
         x = self.screen_width - 200
         y = self.screen_height - 200
 
+        if not hasattr(car, 'active_effects') or not car.active_effects:
+            return self._changed("effects", (), pygame.Rect(x, y, 0, 0))
+
+        key = []
         for i, effect in enumerate(car.active_effects):
             effect_y = y + i * 50
 
             panel_width, panel_height = 180, 45
-            panel_surface = pygame.Surface((panel_width, panel_height), pygame.SRCALPHA)
-
-            if effect['type'] == 'boost':
-                panel_surface.fill((50, 100, 50, 220))
-                border_color = (0, 255, 0)
-                effect_name = "SPEED BOOST"
-            elif effect['type'] == 'slow':
-                panel_surface.fill((100, 50, 50, 220))
-                border_color = (255, 100, 0)
-                effect_name = "SLOWED"
-            else:
-                panel_surface.fill((50, 50, 50, 220))
-                border_color = (150, 150, 150)
-                effect_name = "EFFECT"
-
-            surface.blit(panel_surface, (x, effect_y))
-            pygame.draw.rect(surface, border_color, (x, effect_y, panel_width, panel_height), 2)
-
-            name_text = self.font_small.render(effect_name, True, (255, 255, 255))
-            surface.blit(name_text, (x + 10, effect_y + 5))
+            effect_type = effect['type'] if effect['type'] in self.effect_styles else None
+            border_color = self.effect_styles[effect_type][1]
+
+            surface.blit(self.effect_panels[effect_type], (x, effect_y))
+            surface.blit(self.effect_labels[effect_type], (x + 10, effect_y + 5))
 
             timer_ratio = min(1.0, effect['timer'] / 5.0)
             bar_width = int((panel_width - 20) * timer_ratio)
@@ -200,12 +332,20 @@ class HUD:
             pygame.draw.rect(surface, (50, 50, 50), (x + 10, bar_y, panel_width - 20, bar_height))
             pygame.draw.rect(surface, border_color, (x + 10, bar_y, bar_width, bar_height))
 
-            time_text = self.font_small.render(f"{effect['timer']:.1f}s", True, (200, 200, 200))
+            timer_text = f"{effect['timer']:.1f}s"
+            time_text = self._field(f"effect_{i}", self.font_small, timer_text, (200, 200, 200))
             surface.blit(time_text, (x + 10, effect_y + 22))
-
-    def draw(self, surface, player_car, ai_cars, laps, current_lap_time=0.0, best_lap_time=None):
-        self.draw_speedometer(surface, player_car.speed, player_car.max_speed)
-        self.draw_minimap(surface, player_car, ai_cars)
-        self.draw_lap_counter(surface, laps)
-        self.draw_lap_timer(surface, current_lap_time, best_lap_time)
-        self.draw_active_effects(surface, player_car)
\ No newline at end of file
+            key.append((effect_type, bar_width, timer_text))
+
+        area = pygame.Rect(x, y, 180, (len(key) - 1) * 50 + 45)
+        return self._changed("effects", tuple(key), area)
+
+    def draw(self, surface, player_car, ai_cars, laps, current_lap_time=0.0, best_lap_time=None,
+             standings=None):
+        dirty = self.draw_speedometer(surface, player_car.speed, player_car.max_speed)
+        dirty += self.draw_minimap(surface, player_car, ai_cars)
+        dirty += self.draw_lap_counter(surface, laps)
+        dirty += self.draw_lap_timer(surface, current_lap_time, best_lap_time)
+        dirty += self.draw_position(surface, player_car, standings)
+        dirty += self.draw_active_effects(surface, player_car)
+        return dirty
@@ -0,0 +1,142 @@
+import pygame
+
+class OverlayRenderer:
+    """Countdown, lap, start prompt and results overlays, rendered once and reused."""
+
+    MEDAL_COLORS = {
+        1: (255, 215, 0),
+        2: (192, 192, 192),
+        3: (205, 127, 50)
+    }
+
+    def __init__(self, screen_width, screen_height, max_laps,
+                 white=(255, 255, 255), black=(0, 0, 0), yellow=(255, 255, 0), green=(0, 255, 0)):
+        self.screen_width = screen_width
+        self.screen_height = screen_height
+        self.max_laps = max_laps
+        self.white = white
+        self.black = black
+        self.yellow = yellow
+        self.green = green
+
+        self.large_font = pygame.font.Font(None, 72)
+        self.title_font = pygame.font.Font(None, 96)
+        self.medium_font = pygame.font.Font(None, 48)
+        self.restart_font = pygame.font.Font(None, 42)
+
+        self.countdown_texts = {}
+        for value in [str(digit) for digit in range(10)] + ["START!"]:
+            self.countdown_texts[value] = self._render_countdown(value)
+
+        self.lap_texts = {}
+        for laps in range(max_laps + 2):
+            self.lap_texts[laps] = self._render_lap_message(laps)
+
+        self.start_prompt = self._render_start_prompt()
+
+        self.results_overlay = pygame.Surface((screen_width, screen_height), pygame.SRCALPHA)
+        self.results_overlay.fill((0, 0, 0, 180))
+        self._results_key = None
+        self._results_blits = []
+        self._shown_key = None
+        self._shown_rects = []
+
+    def _render_with_shadow(self, text, color):
+        center = (self.screen_width // 2, self.screen_height // 2)
+        rendered = self.large_font.render(text, True, color)
+        shadow = self.large_font.render(text, True, self.black)
+        return [
+            (shadow, shadow.get_rect(center=(center[0] + 3, center[1] + 3))),
+            (rendered, rendered.get_rect(center=center))
+        ]
+
+    def _render_countdown(self, value):
+        color = self.yellow if value != "START!" else self.green
+        return self._render_with_shadow(value, color)
+
+    def _render_lap_message(self, laps):
+        return self._render_with_shadow(f"OKRĄŻENIE {laps}/{self.max_laps}", self.white)
+
+    def _render_start_prompt(self):
+        start_text = self.large_font.render("Kliknij SPACJE aby zacząć", True, self.yellow)
+
+        padding = 20
+        box = pygame.Surface((start_text.get_width() + padding * 2,
+                              start_text.get_height() + padding * 2))
+        box.fill(self.black)
+        pygame.draw.rect(box, self.yellow, box.get_rect(), 3)
+        box.blit(start_text, (padding, padding))
+        return box, box.get_rect(center=(self.screen_width // 2, self.screen_height // 2))
+
+    def _build_results(self, race_results):
+        blits = [(self.results_overlay, (0, 0))]
+
+        title_text = self.title_font.render("KONIEC!", True, self.yellow)
+        blits.append((title_text, title_text.get_rect(center=(self.screen_width // 2, 100))))
+
+        y_offset = 220
+        for result in race_results:
+            position = result['position']
+            color = self.MEDAL_COLORS.get(position, self.white)
+
+            result_text = f"{position}. {result['name']:12s} - {result['finish_time']:.2f}s"
+            text_surface = self.medium_font.render(result_text, True, color)
+            blits.append((text_surface, text_surface.get_rect(center=(self.screen_width // 2, y_offset))))
+
+            y_offset += 70
+
+        restart_text = self.restart_font.render("Kliknij SPACJE aby zagrać jeszcze raz",
+                                                True, self.green)
+        blits.append((restart_text, restart_text.get_rect(center=(self.screen_width // 2,
+                                                                  self.screen_height - 80))))
+        return blits
+
+    def draw(self, surface, race_manager):
+        shown = []
+        rects = []
+
+        if race_manager.is_countdown_active():
+            value = race_manager.get_countdown_display()
+            texts = self.countdown_texts.get(value)
+            if texts is None:
+                texts = self.countdown_texts[value] = self._render_countdown(value)
+            surface.blits(texts, doreturn=False)
+            shown.append(('countdown', value))
+            rects += [rect for _, rect in texts]
+
+        if (not race_manager.race_started and
+            not race_manager.is_countdown_active() and
+            not race_manager.is_race_finished()):
+            surface.blit(*self.start_prompt)
+            shown.append(('prompt',))
+            rects.append(self.start_prompt[1])
+
+        if race_manager.lap_message_timer > 0 and not race_manager.is_race_finished():
+            texts = self.lap_texts.get(race_manager.laps)
+            if texts is None:
+                texts = self.lap_texts[race_manager.laps] = self._render_lap_message(race_manager.laps)
+            surface.blits(texts, doreturn=False)
+            shown.append(('lap', race_manager.laps))
+            rects += [rect for _, rect in texts]
+
+        if race_manager.is_race_finished():
+            self.draw_results(surface, race_manager.race_results)
+            shown.append(('results', self._results_key))
+            rects.append(surface.get_rect())
+
+        shown = tuple(shown)
+        if shown == self._shown_key:
+            return []
+        dirty = self._shown_rects + rects
+        self._shown_key = shown
+        self._shown_rects = rects
+        return dirty
+
+    def draw_results(self, surface, race_results):
+        key = tuple((result['position'], result['name'], result['finish_time'])
+                    for result in race_results)
+        if key != self._results_key:
+            self._results_key = key
+            self._results_blits = self._build_results(race_results)
+
+        surface.blits(self._results_blits, doreturn=False)
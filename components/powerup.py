@@ -16,8 +16,8 @@ class PowerUp:
             return False
         dx = car.x - self.x
         dy = car.y - self.y
-        distance = math.sqrt(dx * dx + dy * dy)
-        return distance < (self.radius + min(car.width, car.height) / 3)
+        reach = self.radius + min(car.width, car.height) / 3
+        return dx * dx + dy * dy < reach * reach
 
     def apply_effect(self, car):
         pass
@@ -36,13 +36,45 @@ class PowerUp:
                 self.respawn_timer = 0.0
 
     def draw(self, surface, camera_x=0, camera_y=0):
-        pass
+        if not self.active:
+            return None
+        return self.draw_shape(surface, camera_x, camera_y)
+
+    def draw_shape(self, surface, camera_x=0, camera_y=0):
+        return None
 
 class Hazard(PowerUp):
     def __init__(self, x, y, radius=25):
         super().__init__(x, y, radius)
         self.slow_factor = 0.25
         self.effect_duration = 3.0
+        self._build_shape(random.Random(f"{x},{y}"))
+
+    def _build_shape(self, shape_rng):
+        self._oil_points = []
+        num_points = 12
+        for i in range(num_points):
+            angle = (i / num_points) * 2 * math.pi
+            radius_variation = shape_rng.uniform(0.7, 1.0)
+            r = self.radius * radius_variation
+            angle_offset = shape_rng.uniform(-0.2, 0.2)
+            px = self.x + math.cos(angle + angle_offset) * r
+            py = self.y + math.sin(angle + angle_offset) * r
+            self._oil_points.append((px, py))
+
+        self._oil_reflections = []
+        colors = [(60, 40, 80), (40, 60, 80), (50, 70, 60), (70, 60, 90)]
+        for i in range(8):
+            offset_x = shape_rng.randint(-int(self.radius * 0.4), int(self.radius * 0.4))
+            offset_y = shape_rng.randint(-int(self.radius * 0.4), int(self.radius * 0.4))
+            color = shape_rng.choice(colors)
+            size = shape_rng.randint(2, 4)
+            self._oil_reflections.append({
+                'x': self.x + offset_x,
+                'y': self.y + offset_y,
+                'color': color,
+                'size': size
+            })
 
     def apply_effect(self, car):
         if not hasattr(car, 'active_effects'):
@@ -54,41 +86,12 @@ class Hazard(PowerUp):
             'timer': self.effect_duration
         })
 
-    def draw(self, surface, camera_x=0, camera_y=0):
-        if not self.active:
-            return
-
+    def draw_shape(self, surface, camera_x=0, camera_y=0):
         screen_x = self.x - camera_x
         screen_y = self.y - camera_y
 
-        if not hasattr(self, '_oil_points'):
-            self._oil_points = []
-            num_points = 12
-            for i in range(num_points):
-                angle = (i / num_points) * 2 * math.pi
-                radius_variation = random.uniform(0.7, 1.0)
-                r = self.radius * radius_variation
-                angle_offset = random.uniform(-0.2, 0.2)
-                px = self.x + math.cos(angle + angle_offset) * r
-                py = self.y + math.sin(angle + angle_offset) * r
-                self._oil_points.append((px, py))
-
-            self._oil_reflections = []
-            colors = [(60, 40, 80), (40, 60, 80), (50, 70, 60), (70, 60, 90)]
-            for i in range(8):
-                offset_x = random.randint(-int(self.radius * 0.4), int(self.radius * 0.4))
-                offset_y = random.randint(-int(self.radius * 0.4), int(self.radius * 0.4))
-                color = random.choice(colors)
-                size = random.randint(2, 4)
-                self._oil_reflections.append({
-                    'x': self.x + offset_x,
-                    'y': self.y + offset_y,
-                    'color': color,
-                    'size': size
-                })
-
         screen_points = [(int(px - camera_x), int(py - camera_y)) for px, py in self._oil_points]
-        pygame.draw.polygon(surface, (15, 15, 20), screen_points)
+        rect = pygame.draw.polygon(surface, (15, 15, 20), screen_points)
 
         highlight_points = [
             (int(screen_x + (px - screen_x) * 0.5), int(screen_y + (py - screen_y) * 0.5))
@@ -99,7 +102,9 @@ class Hazard(PowerUp):
         for reflection in self._oil_reflections:
             screen_refl_x = int(reflection['x'] - camera_x)
             screen_refl_y = int(reflection['y'] - camera_y)
-            pygame.draw.circle(surface, reflection['color'], (screen_refl_x, screen_refl_y), reflection['size'])
+            rect.union_ip(pygame.draw.circle(surface, reflection['color'], (screen_refl_x, screen_refl_y),
+                                             reflection['size']))
+        return rect
 
 class SpeedBoost(PowerUp):
     def __init__(self, x, y, radius=20):
@@ -118,10 +123,7 @@ class SpeedBoost(PowerUp):
             'timer': self.effect_duration
         })
 
-    def draw(self, surface, camera_x=0, camera_y=0):
-        if not self.active:
-            return
-
+    def draw_shape(self, surface, camera_x=0, camera_y=0):
         screen_x = self.x - camera_x
         screen_y = self.y - camera_y
 
@@ -130,7 +132,7 @@ class SpeedBoost(PowerUp):
             alpha = 50 - i * 15
             glow_surf = pygame.Surface((glow_radius * 2, glow_radius * 2), pygame.SRCALPHA)
             pygame.draw.circle(glow_surf, (255, 200, 0, alpha), (glow_radius, glow_radius), glow_radius - i * 3)
-            surface.blit(glow_surf, (int(screen_x - glow_radius), int(screen_y - glow_radius)))
+            rect = surface.blit(glow_surf, (int(screen_x - glow_radius), int(screen_y - glow_radius)))
 
         points = []
         num_points = 8
@@ -142,16 +144,17 @@ class SpeedBoost(PowerUp):
             points.append((px, py))
 
         pygame.draw.polygon(surface, (255, 215, 0), points)
-        pygame.draw.polygon(surface, (255, 255, 255), points, 2)
+        rect.union_ip(pygame.draw.polygon(surface, (255, 255, 255), points, 2))
         pygame.draw.circle(surface, (255, 165, 0), (int(screen_x), int(screen_y)), int(self.radius * 0.3))
+        return rect
 
-def spawn_powerups_on_racing_line(racing_line, num_hazards=8, num_boosts=5):
+def spawn_powerups_on_racing_line(racing_line, num_hazards=8, num_boosts=5, rng=random):
     powerups = []
     if not racing_line or len(racing_line) < num_hazards + num_boosts:
         return powerups
 
     available_indices = list(range(len(racing_line)))
-    random.shuffle(available_indices)
+    rng.shuffle(available_indices)
     used_positions = []
     min_distance = 200
 
@@ -168,8 +171,8 @@ def spawn_powerups_on_racing_line(racing_line, num_hazards=8, num_boosts=5):
             break
         base_x, base_y = racing_line[idx]
         offset_range = 30
-        offset_x = random.randint(-offset_range, offset_range)
-        offset_y = random.randint(-offset_range, offset_range)
+        offset_x = rng.randint(-offset_range, offset_range)
+        offset_y = rng.randint(-offset_range, offset_range)
         x = base_x + offset_x
         y = base_y + offset_y
         if is_position_valid(x, y):
@@ -183,8 +186,8 @@ def spawn_powerups_on_racing_line(racing_line, num_hazards=8, num_boosts=5):
             break
         base_x, base_y = racing_line[idx]
         offset_range = 30
-        offset_x = random.randint(-offset_range, offset_range)
-        offset_y = random.randint(-offset_range, offset_range)
+        offset_x = rng.randint(-offset_range, offset_range)
+        offset_y = rng.randint(-offset_range, offset_range)
         x = base_x + offset_x
         y = base_y + offset_y
         if is_position_valid(x, y):
@@ -194,6 +197,6 @@ def spawn_powerups_on_racing_line(racing_line, num_hazards=8, num_boosts=5):
 
     return powerups
 
-def spawn_powerups_on_track(track, num_hazards=8, num_boosts=5):
+def spawn_powerups_on_track(track, num_hazards=8, num_boosts=5, rng=random):
     racing_line = track.get_racing_line()
-    return spawn_powerups_on_racing_line(racing_line, num_hazards, num_boosts)
\ No newline at end of file
+    return spawn_powerups_on_racing_line(racing_line, num_hazards, num_boosts, rng)
\ No newline at end of file
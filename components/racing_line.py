@@ -0,0 +1,61 @@
+import numpy as np
+
+class RacingLine:
+    """Geometry of a closed racing line, computed once and shared by everything driving along it.
+
+    Segment i runs from waypoint i to waypoint i + 1, wrapping around; a
+    closing point equal to the first is dropped. Offset lanes shift each
+    waypoint along its segment's normal and are cached by offset.
+    """
+
+    def __init__(self, waypoints):
+        waypoints = [tuple(point) for point in waypoints]
+        if len(waypoints) > 2 and waypoints[0] == waypoints[-1]:
+            waypoints.pop()
+        self.waypoints = waypoints
+
+        count = len(waypoints)
+        self.points = np.array(waypoints, dtype=float).reshape(count, 2)
+        self.deltas = np.roll(self.points, -1, axis=0) - self.points
+        dx = self.deltas[:, 0]
+        dy = self.deltas[:, 1]
+
+        self.segment_lengths = np.sqrt(dx * dx + dy * dy)
+        nonzero = self.segment_lengths > 0
+        safe_lengths = np.where(nonzero, self.segment_lengths, 1.0)
+        self.tangents = np.where(nonzero[:, None], self.deltas / safe_lengths[:, None], 0.0)
+        self.normals = np.column_stack((-dy / safe_lengths, dx / safe_lengths))
+        self.normals[~nonzero] = 0.0
+
+        arc = np.cumsum(self.segment_lengths)
+        self.total_length = float(arc[-1]) if count else 0.0
+        self.cumulative = np.concatenate(([0.0], arc[:-1]))[:count]
+
+        previous = np.roll(self.tangents, 1, axis=0)
+        turn = np.arctan2(previous[:, 0] * self.tangents[:, 1] - previous[:, 1] * self.tangents[:, 0],
+                          previous[:, 0] * self.tangents[:, 0] + previous[:, 1] * self.tangents[:, 1])
+        span = (np.roll(self.segment_lengths, 1) + self.segment_lengths) / 2
+        self.curvature = np.where(span > 0, turn / np.where(span > 0, span, 1.0), 0.0)
+
+        self._lanes = {}
+
+    def __len__(self):
+        return len(self.waypoints)
+
+    def __iter__(self):
+        return iter(self.waypoints)
+
+    def __getitem__(self, index):
+        return self.waypoints[index]
+
+    def lane(self, offset):
+        if offset == 0:
+            return self.waypoints
+
+        lane = self._lanes.get(offset)
+        if lane is None:
+            shifted = self.points + self.normals * offset
+            xs = np.where(self.segment_lengths > 0, shifted[:, 0].astype(int), self.points[:, 0].astype(int))
+            ys = np.where(self.segment_lengths > 0, shifted[:, 1].astype(int), self.points[:, 1].astype(int))
+            lane = self._lanes[offset] = list(zip(xs.tolist(), ys.tolist()))
+        return lane
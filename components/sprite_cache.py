@@ -0,0 +1,47 @@
+import pygame
+
+class RotatedSpriteCache:
+    """Shared cache of rotated car sprites keyed by sprite name and quantized angle."""
+
+    def __init__(self, angle_steps=360):
+        self.angle_steps = angle_steps
+        self.step_size = 360 / angle_steps
+        self.sprites = {}
+        self.hits = 0
+        self.misses = 0
+
+    def _bucket(self, angle):
+        return int(round((angle % 360) / self.step_size)) % self.angle_steps
+
+    def get(self, sprite_name, sprite, angle):
+        key = (sprite_name, self._bucket(angle))
+        rotated = self.sprites.get(key)
+        if rotated is not None:
+            self.hits += 1
+            return rotated
+
+        self.misses += 1
+        rotated = pygame.transform.rotate(sprite, -key[1] * self.step_size)
+        self.sprites[key] = rotated
+        return rotated
+
+    def prebuild(self, sprite_name, sprite):
+        for bucket in range(self.angle_steps):
+            key = (sprite_name, bucket)
+            if key not in self.sprites:
+                self.sprites[key] = pygame.transform.rotate(sprite, -bucket * self.step_size)
+
+    def get_stats(self):
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'entries': len(self.sprites),
+            'angle_steps': self.angle_steps
+        }
+
+    def clear(self):
+        self.sprites = {}
+        self.hits = 0
+        self.misses = 0
+
+rotation_cache = RotatedSpriteCache()
@@ -1,50 +1,223 @@
+import math
+
 import pygame
+import numpy as np
 from pathlib import Path
 
+from .assets import prepare_surface
+from .distance_field import build_signed_distance_field
+from .racing_line import RacingLine
+from .track_cache import TrackCache
+from .track_renderer import TrackTileRenderer
+
+MAP_PATH = Path(__file__).parent.parent / "assets" / "images" / "map.png"
+
+SURFACE_OUT_OF_BOUNDS = 0
+SURFACE_TRACK = 1
+SURFACE_GRASS = 2
+
+RACING_LINE = [
+    (2093, 4787), (1121, 4791), (845, 4718), (744, 4506), (809, 4216),
+    (1063, 3922), (1991, 2962), (2012, 2745), (1904, 2525), (1439, 2285),
+    (1045, 2070), (936, 1780), (966, 1458), (1228, 1160), (1548, 1031),
+    (2197, 1028), (2838, 1071), (3110, 1208), (3269, 1493), (3296, 1765),
+    (3166, 2088), (2922, 2245), (2698, 2285), (2513, 2298), (2487, 2442),
+    (2572, 2716), (2669, 3018), (2925, 3589), (3335, 3901), (3458, 4177),
+    (3433, 4478), (3276, 4692), (2953, 4799), (2489, 4793), (2099, 4785)
+]
+
 class Track:
-    def __init__(self, width, height):
-        map_path = Path(__file__).parent.parent / "assets" / "images" / "map.png"
-        original_map = pygame.image.load(str(map_path)).convert_alpha()
+    def __init__(self, width, height, map_path=MAP_PATH, disk_cache=True):
+        self.cache = TrackCache(map_path, enabled=disk_cache)
+        original_map = prepare_surface(self.cache.load_source_image())
 
         self.scale_factor = 4
-        scaled_width = original_map.get_width() * self.scale_factor
-        scaled_height = original_map.get_height() * self.scale_factor
-        self.map_image = pygame.transform.scale(original_map, (scaled_width, scaled_height))
+        self.source_image = original_map
+        self.width = original_map.get_width() * self.scale_factor
+        self.height = original_map.get_height() * self.scale_factor
+
+        self.renderer = TrackTileRenderer(original_map, self.scale_factor)
+        self.racing_line = RacingLine(RACING_LINE)
+
+        self.surface_grid = self.cache.load_array("surface_grid",
+                                                  lambda: self._build_surface_grid(original_map))
+        self.grid_height, self.grid_width = self.surface_grid.shape
+        self._surface_bytes = self.surface_grid.tobytes()
+
+        self.distance_cap = 32
+        self.distance_field = self.cache.load_array(
+            f"distance_field_{self.distance_cap}",
+            lambda: build_signed_distance_field(self.surface_grid == SURFACE_TRACK, self.distance_cap))
+
+    def get_minimap_image(self, size):
+        width, height = size
+        image = self.cache.load_image(f"minimap_{width}x{height}",
+                                      lambda: pygame.transform.scale(self.source_image, size))
+        return prepare_surface(image)
 
-        self.width = self.map_image.get_width()
-        self.height = self.map_image.get_height()
+    @staticmethod
+    def _build_surface_grid(image):
+        rgb = pygame.surfarray.array3d(image).transpose(1, 0, 2).astype(np.int16)
+        r, g, b = rgb[..., 0], rgb[..., 1], rgb[..., 2]
+
+        grass = (g > 100) & (g > r + 20) & (g > b + 20)
+        asphalt = (r < 150) & (g < 150) & (b < 150)
+        kerb = (r > 150) & (g > 100) & (b < 100)
+
+        grid = np.full(r.shape, SURFACE_OUT_OF_BOUNDS, dtype=np.uint8)
+        grid[(asphalt | kerb) & ~grass] = SURFACE_TRACK
+        grid[grass] = SURFACE_GRASS
+        return grid
 
     def draw(self, surface, camera_x=0, camera_y=0):
-        surface.blit(self.map_image, (-camera_x, -camera_y))
+        self.renderer.draw(surface, camera_x, camera_y)
 
-    def is_on_track(self, x, y):
+    def get_surface(self, x, y):
         map_x = int(x)
         map_y = int(y)
 
         if map_x < 0 or map_x >= self.width or map_y < 0 or map_y >= self.height:
-            return False
-
-        try:
-            color = self.map_image.get_at((map_x, map_y))
-            r, g, b = color[:3]
-
-            if g > 100 and g > r + 20 and g > b + 20:
-                return False
-            if r < 150 and g < 150 and b < 150:
-                return True
-            if r > 150 and g > 100 and b < 100:
-                return True
-            return False
-        except:
-            return False
+            return SURFACE_OUT_OF_BOUNDS
+
+        index = (map_y // self.scale_factor) * self.grid_width + map_x // self.scale_factor
+        return self._surface_bytes[index]
+
+    def is_on_track(self, x, y):
+        return self.get_surface(x, y) == SURFACE_TRACK
+
+    def get_surfaces(self, xs, ys):
+        map_x = np.asarray(xs).astype(np.int64)
+        map_y = np.asarray(ys).astype(np.int64)
+
+        inside = (map_x >= 0) & (map_x < self.width) & (map_y >= 0) & (map_y < self.height)
+        surfaces = np.full(map_x.shape, SURFACE_OUT_OF_BOUNDS, dtype=np.uint8)
+        surfaces[inside] = self.surface_grid[map_y[inside] // self.scale_factor,
+                                             map_x[inside] // self.scale_factor]
+        return surfaces
+
+    def are_on_track(self, xs, ys):
+        return self.get_surfaces(xs, ys) == SURFACE_TRACK
+
+    def _cell(self, cell_x, cell_y):
+        if cell_x < 0 or cell_x >= self.grid_width or cell_y < 0 or cell_y >= self.grid_height:
+            return SURFACE_OUT_OF_BOUNDS
+        return self._surface_bytes[cell_y * self.grid_width + cell_x]
+
+    def surface_normal(self, x, y, radius=2):
+        cell_x = int(x // self.scale_factor)
+        cell_y = int(y // self.scale_factor)
+        offsets = np.arange(-radius, radius + 1)
+        rows = np.clip(cell_y + offsets, 0, self.grid_height - 1)
+        cols = np.clip(cell_x + offsets, 0, self.grid_width - 1)
+        wall = self.surface_grid[np.ix_(rows, cols)] != SURFACE_TRACK
+
+        normal_x = -float((wall * offsets[np.newaxis, :]).sum())
+        normal_y = -float((wall * offsets[:, np.newaxis]).sum())
+        length = math.sqrt(normal_x * normal_x + normal_y * normal_y)
+        if length == 0:
+            return None
+        return normal_x / length, normal_y / length
+
+    def _grid_cell(self, x, y):
+        cell_x = min(max(int(x // self.scale_factor), 0), self.grid_width - 1)
+        cell_y = min(max(int(y // self.scale_factor), 0), self.grid_height - 1)
+        return cell_x, cell_y
+
+    def distance_to_wall(self, x, y):
+        if x < 0 or x >= self.width or y < 0 or y >= self.height:
+            return -float(self.distance_cap * self.scale_factor)
+        cell_x, cell_y = self._grid_cell(x, y)
+        return float(self.distance_field[cell_y, cell_x]) * self.scale_factor
+
+    def wall_normal(self, x, y):
+        cell_x, cell_y = self._grid_cell(x, y)
+        field = self.distance_field
+        left = max(cell_x - 1, 0)
+        right = min(cell_x + 1, self.grid_width - 1)
+        up = max(cell_y - 1, 0)
+        down = min(cell_y + 1, self.grid_height - 1)
+
+        gradient_x = float(field[cell_y, right]) - float(field[cell_y, left])
+        gradient_y = float(field[down, cell_x]) - float(field[up, cell_x])
+        length = math.sqrt(gradient_x * gradient_x + gradient_y * gradient_y)
+        if length == 0:
+            return 0.0, 0.0
+        return gradient_x / length, gradient_y / length
+
+    def distances_to_wall(self, xs, ys):
+        xs = np.asarray(xs, dtype=float)
+        ys = np.asarray(ys, dtype=float)
+        inside = (xs >= 0) & (xs < self.width) & (ys >= 0) & (ys < self.height)
+        cell_x = np.minimum(np.maximum((xs // self.scale_factor).astype(np.int64), 0), self.grid_width - 1)
+        cell_y = np.minimum(np.maximum((ys // self.scale_factor).astype(np.int64), 0), self.grid_height - 1)
+        distances = self.distance_field[cell_y, cell_x].astype(float) * self.scale_factor
+        return np.where(inside, distances, -float(self.distance_cap * self.scale_factor))
+
+    def wall_normals(self, xs, ys):
+        cell_x = np.minimum(np.maximum((np.asarray(xs, dtype=float) // self.scale_factor).astype(np.int64), 0),
+                            self.grid_width - 1)
+        cell_y = np.minimum(np.maximum((np.asarray(ys, dtype=float) // self.scale_factor).astype(np.int64), 0),
+                            self.grid_height - 1)
+        field = self.distance_field
+        left = np.maximum(cell_x - 1, 0)
+        right = np.minimum(cell_x + 1, self.grid_width - 1)
+        up = np.maximum(cell_y - 1, 0)
+        down = np.minimum(cell_y + 1, self.grid_height - 1)
+
+        gradient_x = field[cell_y, right].astype(float) - field[cell_y, left].astype(float)
+        gradient_y = field[down, cell_x].astype(float) - field[up, cell_x].astype(float)
+        length = np.sqrt(gradient_x * gradient_x + gradient_y * gradient_y)
+        safe = np.where(length == 0, 1.0, length)
+        return gradient_x / safe, gradient_y / safe
+
+    def sweep(self, x0, y0, x1, y1):
+        scale = self.scale_factor
+        if not self.is_on_track(x0, y0):
+            normal = self.surface_normal(x0, y0) or (0.0, 0.0)
+            return 0.0, x0, y0, normal[0], normal[1]
+
+        dx = x1 - x0
+        dy = y1 - y0
+        cell_x = int(x0 // scale)
+        cell_y = int(y0 // scale)
+        end_x = int(x1 // scale)
+        end_y = int(y1 // scale)
+
+        step_x = 1 if dx > 0 else -1
+        step_y = 1 if dy > 0 else -1
+        if dx:
+            t_delta_x = scale / abs(dx)
+            t_max_x = ((cell_x + (step_x > 0)) * scale - x0) / dx
+        else:
+            t_delta_x = t_max_x = math.inf
+        if dy:
+            t_delta_y = scale / abs(dy)
+            t_max_y = ((cell_y + (step_y > 0)) * scale - y0) / dy
+        else:
+            t_delta_y = t_max_y = math.inf
+
+        while cell_x != end_x or cell_y != end_y:
+            if t_max_x < t_max_y:
+                t = t_max_x
+                cell_x += step_x
+                t_max_x += t_delta_x
+                axis_normal = (-step_x, 0.0)
+            else:
+                t = t_max_y
+                cell_y += step_y
+                t_max_y += t_delta_y
+                axis_normal = (0.0, -step_y)
+
+            if t > 1.0:
+                break
+
+            if self._cell(cell_x, cell_y) != SURFACE_TRACK:
+                hit_x = x0 + dx * t
+                hit_y = y0 + dy * t
+                normal_x, normal_y = self.surface_normal(hit_x, hit_y) or axis_normal
+                return t, hit_x, hit_y, normal_x, normal_y
+
+        return None
 
     def get_racing_line(self):
-        return [
-            (2093, 4787), (1121, 4791), (845, 4718), (744, 4506), (809, 4216),
-            (1063, 3922), (1991, 2962), (2012, 2745), (1904, 2525), (1439, 2285),
-            (1045, 2070), (936, 1780), (966, 1458), (1228, 1160), (1548, 1031),
-            (2197, 1028), (2838, 1071), (3110, 1208), (3269, 1493), (3296, 1765),
-            (3166, 2088), (2922, 2245), (2698, 2285), (2513, 2298), (2487, 2442),
-            (2572, 2716), (2669, 3018), (2925, 3589), (3335, 3901), (3458, 4177),
-            (3433, 4478), (3276, 4692), (2953, 4799), (2489, 4793), (2099, 4785)
-        ]
\ No newline at end of file
+        return self.racing_line
@@ -0,0 +1,105 @@
+import json
+import shutil
+import time
+from pathlib import Path
+
+import numpy as np
+import pygame
+
+from .assets import CACHE_PATH, file_digest, write_atomic
+
+TRACK_CACHE_VERSION = 1
+LEGACY_DIRECTORIES = ("distance_fields",)
+
+class TrackCache:
+    """Versioned directory of artifacts derived from a track image, keyed by the image's hash.
+
+    Arrays are stored as .npy and memory-mapped on load; images as PNG.
+    A missing or unreadable artifact is rebuilt and written back through a
+    temporary file, so processes sharing a cold cache never load a partial
+    one. Directories of older cache layouts are removed on the first write.
+    """
+
+    def __init__(self, source_path, cache_path=CACHE_PATH, enabled=True):
+        self.cache_path = Path(cache_path)
+        self.source_path = Path(source_path)
+        self.enabled = enabled
+        self.digest = file_digest(self.source_path)
+        self.directory = (Path(cache_path) / "tracks" /
+                          f"{self.source_path.stem}_{self.digest}_v{TRACK_CACHE_VERSION}")
+        self.built = []
+
+    def path(self, name):
+        return self.directory / name
+
+    def _prepare_directory(self):
+        self.directory.mkdir(parents=True, exist_ok=True)
+        for name in LEGACY_DIRECTORIES:
+            shutil.rmtree(self.cache_path / name, ignore_errors=True)
+
+    def _stored(self, name):
+        self.built.append(name)
+        self._write_manifest()
+
+    def _write_manifest(self):
+        manifest = {
+            'version': TRACK_CACHE_VERSION,
+            'source': self.source_path.name,
+            'digest': self.digest,
+            'artifacts': sorted(p.name for p in self.directory.iterdir()
+                                if p.name != "manifest.json" and not p.name.startswith(".")),
+            'updated': time.strftime("%Y-%m-%dT%H:%M:%S")
+        }
+
+        def write(temp_path):
+            with open(temp_path, 'w') as f:
+                json.dump(manifest, f, indent=2)
+
+        write_atomic(self.path("manifest.json"), write)
+
+    def load_array(self, name, build):
+        path = self.path(f"{name}.npy")
+        if self.enabled and path.exists():
+            try:
+                return np.asarray(np.load(path, mmap_mode='r'))
+            except (OSError, ValueError):
+                pass
+
+        array = np.ascontiguousarray(build())
+        if self.enabled:
+            try:
+                self._prepare_directory()
+                write_atomic(path, lambda temp_path: np.save(temp_path, array))
+                self._stored(path.name)
+            except OSError:
+                pass
+        return array
+
+    def load_image(self, name, build):
+        path = self.path(f"{name}.png")
+        if self.enabled and path.exists():
+            try:
+                return pygame.image.load(str(path))
+            except pygame.error:
+                pass
+
+        image = build()
+        if self.enabled:
+            try:
+                self._prepare_directory()
+                write_atomic(path, lambda temp_path: pygame.image.save(image, temp_path))
+                self._stored(path.name)
+            except (OSError, pygame.error):
+                pass
+        return image
+
+    def load_source_image(self):
+        def decode():
+            image = pygame.image.load(str(self.source_path))
+            width, height = image.get_size()
+            pixels = np.frombuffer(pygame.image.tobytes(image, "RGBA"), dtype=np.uint8)
+            return pixels.reshape(height, width, 4)
+
+        pixels = self.load_array("pixels", decode)
+        height, width = pixels.shape[:2]
+        return pygame.image.frombytes(pixels.tobytes(), (width, height), "RGBA")
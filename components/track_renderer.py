@@ -0,0 +1,73 @@
+import pygame
+from collections import OrderedDict
+
+class TrackTileRenderer:
+    """Draws the track map as fixed-size tiles, blitting only those inside the viewport."""
+
+    def __init__(self, source_image, scale_factor, tile_size=128, cache_size=24, prescale=False):
+        self.source_image = source_image
+        self.scale_factor = scale_factor
+        self.tile_size = tile_size
+        self.scaled_tile_size = tile_size * scale_factor
+        self.cache_size = cache_size
+        self.prescale = prescale
+
+        source_width = source_image.get_width()
+        source_height = source_image.get_height()
+        self.cols = (source_width + tile_size - 1) // tile_size
+        self.rows = (source_height + tile_size - 1) // tile_size
+
+        self.source_tiles = {}
+        for row in range(self.rows):
+            for col in range(self.cols):
+                rect = pygame.Rect(col * tile_size, row * tile_size, tile_size, tile_size)
+                rect = rect.clip(source_image.get_rect())
+                self.source_tiles[(col, row)] = source_image.subsurface(rect)
+
+        self.tile_cache = OrderedDict()
+        if prescale:
+            for key in self.source_tiles:
+                self.tile_cache[key] = self._scale_tile(key)
+
+    def _scale_tile(self, key):
+        tile = self.source_tiles[key]
+        return pygame.transform.scale(tile, (tile.get_width() * self.scale_factor,
+                                             tile.get_height() * self.scale_factor))
+
+    def get_tile(self, col, row):
+        key = (col, row)
+        tile = self.tile_cache.get(key)
+        if tile is not None:
+            if not self.prescale:
+                self.tile_cache.move_to_end(key)
+            return tile
+
+        tile = self._scale_tile(key)
+        self.tile_cache[key] = tile
+        if len(self.tile_cache) > self.cache_size:
+            self.tile_cache.popitem(last=False)
+        return tile
+
+    def get_visible_tiles(self, camera_x, camera_y, view_width, view_height):
+        first_col = max(0, int(camera_x // self.scaled_tile_size))
+        first_row = max(0, int(camera_y // self.scaled_tile_size))
+        last_col = min(self.cols - 1, int((camera_x + view_width) // self.scaled_tile_size))
+        last_row = min(self.rows - 1, int((camera_y + view_height) // self.scaled_tile_size))
+
+        for row in range(first_row, last_row + 1):
+            for col in range(first_col, last_col + 1):
+                yield col, row
+
+    def draw(self, surface, camera_x=0, camera_y=0):
+        view_width, view_height = surface.get_size()
+        offset_x = int(-camera_x)
+        offset_y = int(-camera_y)
+
+        for col, row in self.get_visible_tiles(camera_x, camera_y, view_width, view_height):
+            tile = self.get_tile(col, row)
+            surface.blit(tile, (col * self.scaled_tile_size + offset_x,
+                                row * self.scaled_tile_size + offset_y))
+
+    def clear_cache(self):
+        if not self.prescale:
+            self.tile_cache.clear()
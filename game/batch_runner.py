@@ -0,0 +1,141 @@
+import copy
+import multiprocessing
+
+from components.track import Track
+from game.game_config import GameConfig
+from game.simulation import RaceSimulation
+
+_worker_track = None
+
+def _init_worker():
+    global _worker_track
+    _worker_track = Track(GameConfig.SCREEN_WIDTH, GameConfig.SCREEN_HEIGHT)
+
+def run_race(config):
+    if _worker_track is None:
+        _init_worker()
+
+    simulation = RaceSimulation(_worker_track, spawn_data=config['spawn_data'],
+                                seed=config['seed'], player_autopilot=True,
+                                physics=config['physics'],
+                                track_collision=config.get('track_collision', "point"))
+    stats = simulation.run_until_finished(config['dt'], config['max_sim_time'])
+    stats['label'] = config['label']
+    stats['seed'] = config['seed']
+    stats['tracked'] = config['tracked']
+    return stats
+
+def build_configs(spawn_variants, seeds, speeds=None, offsets=None, tune_indices=None,
+                  dt=1.0 / GameConfig.SIM_RATE, max_sim_time=600.0, physics="scalar",
+                  track_collision="point"):
+    configs = []
+
+    def add(label, spawn_data, tracked):
+        for seed in seeds:
+            configs.append({
+                'label': label,
+                'spawn_data': spawn_data,
+                'seed': seed,
+                'tracked': tracked,
+                'dt': dt,
+                'max_sim_time': max_sim_time,
+                'physics': physics,
+                'track_collision': track_collision
+            })
+
+    for variant_name, spawn_data in spawn_variants:
+        ai_entries = spawn_data.get("ai_cars", [])
+        add(f"{variant_name}", spawn_data, None)
+
+        if not speeds and not offsets:
+            continue
+
+        indices = tune_indices if tune_indices is not None else range(len(ai_entries))
+        for index in indices:
+            for speed in speeds or [ai_entries[index]["speed"]]:
+                for offset in offsets or [ai_entries[index]["offset"]]:
+                    variant = copy.deepcopy(spawn_data)
+                    variant["ai_cars"][index]["speed"] = speed
+                    variant["ai_cars"][index]["offset"] = offset
+                    add(f"{variant_name}:AI {index + 1} v={speed} off={offset}", variant, f"AI {index + 1}")
+
+    return configs
+
+def run_batch(configs, processes=None, chunksize=4):
+    if processes == 1:
+        return [run_race(config) for config in configs]
+
+    with multiprocessing.Pool(processes, initializer=_init_worker) as pool:
+        return list(pool.imap_unordered(run_race, configs, chunksize))
+
+def summarize(results):
+    rows = {}
+    unfinished = {}
+
+    for race in results:
+        unfinished.setdefault(race['label'], 0)
+        if not race['finished']:
+            unfinished[race['label']] += 1
+            continue
+
+        for result in race['results']:
+            if race['tracked'] is not None and result['name'] != race['tracked']:
+                continue
+            key = (race['label'], result['name'])
+            row = rows.setdefault(key, {
+                'label': race['label'],
+                'name': result['name'],
+                'races': 0,
+                'wins': 0,
+                'position_sum': 0,
+                'time_sum': 0.0
+            })
+            row['races'] += 1
+            row['wins'] += 1 if result['position'] == 1 else 0
+            row['position_sum'] += result['position']
+            row['time_sum'] += result['finish_time']
+
+    summary = []
+    for row in rows.values():
+        summary.append({
+            'label': row['label'],
+            'name': row['name'],
+            'races': row['races'],
+            'unfinished': unfinished[row['label']],
+            'wins': row['wins'],
+            'avg_position': row['position_sum'] / row['races'],
+            'avg_time': row['time_sum'] / row['races']
+        })
+
+    labels = {row['label'] for row in summary}
+    for label, count in unfinished.items():
+        if label not in labels:
+            summary.append({
+                'label': label,
+                'name': "-",
+                'races': 0,
+                'unfinished': count,
+                'wins': 0,
+                'avg_position': None,
+                'avg_time': None
+            })
+
+    summary.sort(key=lambda row: (row['label'], row['avg_position'] is None, row['avg_position'] or 0))
+    return summary
+
+def format_summary(summary):
+    label_width = max([len("Konfiguracja")] + [len(row['label']) for row in summary])
+    lines = [
+        f"{'Konfiguracja':{label_width}s}  {'Kierowca':10s} {'Wyścigi':>7s} {'Niedok.':>7s} "
+        f"{'Wygrane':>7s} {'Śr. poz.':>8s} {'Śr. czas':>9s}"
+    ]
+    for row in summary:
+        if row['races']:
+            averages = f"{row['avg_position']:8.2f} {row['avg_time']:8.2f}s"
+        else:
+            averages = f"{'-':>8s} {'-':>9s}"
+        lines.append(
+            f"{row['label']:{label_width}s}  {row['name']:10s} {row['races']:7d} {row['unfinished']:7d} "
+            f"{row['wins']:7d} {averages}"
+        )
+    return "\n".join(lines)
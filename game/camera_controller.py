@@ -2,17 +2,25 @@ import random
 
 class CameraController:
 
-    def __init__(self, screen_width, screen_height):
+    def __init__(self, screen_width, screen_height, rng=None):
         self.screen_width = screen_width
         self.screen_height = screen_height
         self.camera_x = 0
         self.camera_y = 0
+        self.prev_camera_x = 0
+        self.prev_camera_y = 0
         self.camera_smoothness = 5.0
 
         self.camera_shake = 0
+        self.shake_x = 0
+        self.shake_y = 0
         self.shake_decay = 10.0
+        self.rng = rng if rng is not None else random
 
     def update(self, target_x, target_y, dt):
+        self.prev_camera_x = self.camera_x
+        self.prev_camera_y = self.camera_y
+
         target_camera_x = target_x - self.screen_width // 2
         target_camera_y = target_y - self.screen_height // 2
 
@@ -23,13 +31,21 @@ class CameraController:
         if self.camera_shake > 0:
             self.camera_shake = max(0, self.camera_shake - self.shake_decay * dt)
 
+        shake = self.camera_shake
+        self.shake_x = self.rng.uniform(-shake, shake) if shake > 0 else 0
+        self.shake_y = self.rng.uniform(-shake, shake) if shake > 0 else 0
+
     def add_shake(self, intensity):
         self.camera_shake = max(self.camera_shake, intensity)
 
-    def get_camera_offset(self):
-        shake_x = random.uniform(-self.camera_shake, self.camera_shake) if self.camera_shake > 0 else 0
-        shake_y = random.uniform(-self.camera_shake, self.camera_shake) if self.camera_shake > 0 else 0
-        return self.camera_x + shake_x, self.camera_y + shake_y
+    def get_state(self):
+        return self.prev_camera_x, self.prev_camera_y, self.camera_x, self.camera_y, self.shake_x, self.shake_y
+
+    def get_camera_offset(self, alpha=1.0, state=None):
+        prev_x, prev_y, camera_x, camera_y, shake_x, shake_y = state if state is not None else self.get_state()
+        camera_x = prev_x + (camera_x - prev_x) * alpha
+        camera_y = prev_y + (camera_y - prev_y) * alpha
+        return camera_x + shake_x, camera_y + shake_y
 
     def get_camera_position(self):
         return self.camera_x, self.camera_y
\ No newline at end of file
@@ -0,0 +1,140 @@
+import math
+
+class SectorGate:
+    """Checkpoint gate: a segment through the checkpoint, perpendicular to the racing direction."""
+
+    __slots__ = ('x', 'y', 'dir_x', 'dir_y', 'half_width', 'depth')
+
+    def __init__(self, x, y, dir_x, dir_y, half_width, depth):
+        self.x = x
+        self.y = y
+        self.dir_x = dir_x
+        self.dir_y = dir_y
+        self.half_width = half_width
+        self.depth = depth
+
+    def is_passed(self, car_x, car_y):
+        rel_x = car_x - self.x
+        rel_y = car_y - self.y
+        along = rel_x * self.dir_x + rel_y * self.dir_y
+        if along < 0 or along > self.depth:
+            return False
+        lateral = rel_x * self.dir_y - rel_y * self.dir_x
+        return -self.half_width <= lateral <= self.half_width
+
+class CheckpointState:
+    __slots__ = ('next_index', 'lap_start_time', 'sector_start_time', 'sector_times',
+                 'last_sector_times', 'best_sector_times')
+
+    def __init__(self, race_time, sector_count):
+        self.next_index = 0
+        self.lap_start_time = race_time
+        self.sector_start_time = race_time
+        self.sector_times = []
+        self.last_sector_times = []
+        self.best_sector_times = [None] * sector_count
+
+class CheckpointTracker:
+    """Tracks each car's next expected checkpoint gate, lap validity and sector split times.
+
+    With a track, each gate spans the track's local width plus gate_margin
+    on either side and is as deep as the track is wide, so it cannot reach
+    a neighbouring section; gate_half_width caps the measurement. Without
+    one, gates fall back to the fixed gate_half_width and gate_depth.
+    """
+
+    def __init__(self, checkpoints, sector_count=3, track=None, gate_half_width=300, gate_depth=600,
+                 gate_margin=24):
+        self.gates = []
+        count = len(checkpoints)
+        for i, (x, y) in enumerate(checkpoints):
+            prev_x, prev_y = checkpoints[i - 1]
+            next_x, next_y = checkpoints[(i + 1) % count]
+            dx = next_x - prev_x
+            dy = next_y - prev_y
+            length = math.sqrt(dx * dx + dy * dy) or 1.0
+            dir_x = dx / length
+            dir_y = dy / length
+
+            half_width, depth = gate_half_width, gate_depth
+            if track is not None:
+                left = self._track_extent(track, x, y, dir_y, -dir_x, gate_half_width)
+                right = self._track_extent(track, x, y, -dir_y, dir_x, gate_half_width)
+                half_width = min(max(left, right) + gate_margin, gate_half_width)
+                depth = left + right
+            self.gates.append(SectorGate(x, y, dir_x, dir_y, half_width, depth))
+
+        self.sector_count = sector_count if count >= sector_count else 1
+        self.sector_boundaries = {count * k // self.sector_count for k in range(1, self.sector_count)}
+        self.states = {}
+
+    @staticmethod
+    def _track_extent(track, x, y, dir_x, dir_y, limit):
+        step = track.scale_factor
+        distance = 0
+        while distance < limit and track.is_on_track(x + dir_x * distance, y + dir_y * distance):
+            distance += step
+        return distance
+
+    def reset(self, cars, race_time=0.0):
+        self.states = {car: CheckpointState(race_time, self.sector_count) for car in cars}
+
+    def update(self, car, race_time):
+        state = self.states.get(car)
+        if state is None or state.next_index >= len(self.gates):
+            return
+
+        if self.gates[state.next_index].is_passed(car.x, car.y):
+            state.next_index += 1
+            if state.next_index in self.sector_boundaries:
+                self._close_sector(state, race_time)
+
+    def _close_sector(self, state, race_time):
+        sector_time = race_time - state.sector_start_time
+        sector = len(state.sector_times)
+        state.sector_times.append(sector_time)
+        state.sector_start_time = race_time
+
+        if sector < self.sector_count:
+            best = state.best_sector_times[sector]
+            if best is None or sector_time < best:
+                state.best_sector_times[sector] = sector_time
+
+    def is_lap_complete(self, car):
+        state = self.states.get(car)
+        return state is None or state.next_index >= len(self.gates)
+
+    def start_lap(self, car, race_time, completed=True):
+        state = self.states.get(car)
+        if state is None:
+            return
+
+        if completed:
+            self._close_sector(state, race_time)
+            state.last_sector_times = state.sector_times
+
+        state.next_index = 0
+        state.lap_start_time = race_time
+        state.sector_start_time = race_time
+        state.sector_times = []
+
+    def get_progress(self, car):
+        state = self.states.get(car)
+        if state is None or not self.gates:
+            return 0, 0.0
+
+        gate = self.gates[min(state.next_index, len(self.gates) - 1)]
+        dx = gate.x - car.x
+        dy = gate.y - car.y
+        return state.next_index, -(dx * dx + dy * dy)
+
+    def get_splits(self, car):
+        state = self.states.get(car)
+        if state is None:
+            return None
+
+        return {
+            'current': list(state.sector_times),
+            'last': list(state.last_sector_times),
+            'best': list(state.best_sector_times)
+        }
@@ -1,66 +1,170 @@
+import math
+import random
+
 from components import collision
 from components import powerup 
+from game.spatial_hash import SpatialHash
 
 class CollisionManager:
 
-    def __init__(self, track, effect_manager, sound_manager): 
+    TRACK_MODES = ("point", "sweep", "slide")
+
+    def __init__(self, track, effect_manager, sound_manager, rng=None, cell_size=128,
+                 track_mode="point", slide_impact_speed=120, slide_max_into=0.7, contact_offset=1.0): 
+        if track_mode not in self.TRACK_MODES:
+            raise ValueError(f"Nieznany tryb kolizji z torem: {track_mode}")
+
         self.track = track
         self.effect_manager = effect_manager
         self.sound_manager = sound_manager 
+        self.rng = rng if rng is not None else random
+        self.track_mode = track_mode
+        self.slide_impact_speed = slide_impact_speed
+        self.slide_max_into = slide_max_into
+        self.contact_offset = contact_offset
+
+        self.cell_size = cell_size
+        self.car_hash = SpatialHash(cell_size)
+        self.powerup_hash = SpatialHash(cell_size)
+        self._hashed_powerups = None
+        self._powerup_reach = 0
+        self.touched = []
 
     def update(self, player_car, ai_cars, powerups):
         camera_shake_intensity = 0
+        self.touched = []
+
+        cars = [player_car] + list(ai_cars)
+        if self.track_mode == "point":
+            on_track = self.track.are_on_track([car.x for car in cars], [car.y for car in cars])
+
+            shake = self._handle_car_track_collision(player_car, on_track[0])
+            camera_shake_intensity = max(camera_shake_intensity, shake)
 
-        shake = self._handle_car_track_collision(player_car)
-        camera_shake_intensity = max(camera_shake_intensity, shake)
-
-        for ai_car in ai_cars:
-            self._handle_car_track_collision(ai_car)
-
-        self._handle_powerup_collisions(player_car, ai_cars, powerups)
-
-        for ai_car in ai_cars:
-            if collision.check_car_collision(player_car, ai_car):
-                collision.handle_car_collision(player_car, ai_car)
-                collision_x = (player_car.x + ai_car.x) / 2
-                collision_y = (player_car.y + ai_car.y) / 2
-                self.effect_manager.add_collision_effect(collision_x, collision_y, num_particles=15)
-                self.sound_manager.play_collision() 
-                camera_shake_intensity = max(camera_shake_intensity, 2.0)
-
-        for i, ai_car1 in enumerate(ai_cars):
-            for ai_car2 in ai_cars[i+1:]:
-                if collision.check_car_collision(ai_car1, ai_car2):
-                    collision.handle_car_collision(ai_car1, ai_car2)
-                    collision_x = (ai_car1.x + ai_car2.x) / 2
-                    collision_y = (ai_car1.y + ai_car2.y) / 2
+            for ai_car, ai_on_track in zip(ai_cars, on_track[1:]):
+                self._handle_car_track_collision(ai_car, ai_on_track)
+        else:
+            shake = self._sweep_car_track_collision(player_car)
+            camera_shake_intensity = max(camera_shake_intensity, shake)
+
+            for ai_car in ai_cars:
+                self._sweep_car_track_collision(ai_car)
+
+        self._handle_powerup_collisions(cars, powerups)
+
+        self.car_hash.clear()
+        for index, car in enumerate(cars):
+            self.car_hash.insert(index, car.x, car.y)
+
+        for i, j in sorted((min(a, b), max(a, b)) for a, b in self.car_hash.candidate_pairs()):
+            car1 = cars[i]
+            car2 = cars[j]
+            if collision.check_car_collision(car1, car2):
+                collision.handle_car_collision(car1, car2, self.rng)
+                self.touched += (car1, car2)
+                collision_x = (car1.x + car2.x) / 2
+                collision_y = (car1.y + car2.y) / 2
+                if self.effect_manager:
                     self.effect_manager.add_collision_effect(collision_x, collision_y, num_particles=15)
+                if self.sound_manager:
                     self.sound_manager.play_collision()
+                if i == 0:
+                    camera_shake_intensity = max(camera_shake_intensity, 2.0)
 
         return camera_shake_intensity
 
-    def _handle_car_track_collision(self, car):
-        if collision.check_collision(car, self.track):
+    def _push_out_of_wall(self, car):
+        clearance = self.track.distance_to_wall(car.x, car.y)
+        if clearance >= 0:
+            return
+        normal_x, normal_y = self.track.wall_normal(car.x, car.y)
+        push = self.contact_offset - clearance
+        car.x += normal_x * push
+        car.y += normal_y * push
+
+    def _handle_car_track_collision(self, car, on_track):
+        if not on_track:
+            self.touched.append(car)
+            self._push_out_of_wall(car)
             collision.handle_collision(car, self.track)
-            self.effect_manager.add_collision_effect(car.x, car.y, num_particles=8)
-            self.sound_manager.play_collision() 
+            if self.effect_manager:
+                self.effect_manager.add_collision_effect(car.x, car.y, num_particles=8)
+            if self.sound_manager:
+                self.sound_manager.play_collision()
             return 2.0
 
         return 0
 
-    def _handle_powerup_collisions(self, player_car, ai_cars, powerups):
-        for pu in powerups:
-            if pu.check_collision(player_car):
-                if isinstance(pu, powerup.Hazard):
-                    self.sound_manager.play_power_down()
-                elif isinstance(pu, powerup.SpeedBoost):
-                    self.sound_manager.play_power_up()
-                pu.collect(player_car)
+    def _sweep_car_track_collision(self, car):
+        contact = self.track.sweep(car.prev_x, car.prev_y, car.x, car.y)
+        if contact is None:
+            return 0
 
-            for ai_car in ai_cars:
-                if pu.check_collision(ai_car):
-                    if isinstance(pu, powerup.Hazard):
-                        self.sound_manager.play_power_down()
-                    elif isinstance(pu, powerup.SpeedBoost):
-                        self.sound_manager.play_power_up()
-                    pu.collect(ai_car)
\ No newline at end of file
+        self.touched.append(car)
+        fraction, hit_x, hit_y, normal_x, normal_y = contact
+        motion_x = car.x - car.prev_x
+        motion_y = car.y - car.prev_y
+        distance = math.sqrt(motion_x * motion_x + motion_y * motion_y)
+
+        if fraction > 0 and distance > 0:
+            backoff = max(0.0, fraction - self.contact_offset / distance)
+            car.x = car.prev_x + motion_x * backoff
+            car.y = car.prev_y + motion_y * backoff
+        else:
+            self._push_out_of_wall(car)
+
+        impact = None
+        if self.track_mode == "slide" and fraction > 0:
+            impact = self._slide(car, motion_x, motion_y, distance, fraction, normal_x, normal_y)
+
+        if impact is None:
+            car.apply_stun()
+        elif impact < self.slide_impact_speed:
+            return 0
+
+        if self.effect_manager:
+            self.effect_manager.add_collision_effect(hit_x, hit_y, num_particles=8)
+        if self.sound_manager:
+            self.sound_manager.play_collision()
+        return 2.0
+
+    def _slide(self, car, motion_x, motion_y, distance, fraction, normal_x, normal_y):
+        into = (motion_x * normal_x + motion_y * normal_y) / distance
+        if into >= 0 or -into > self.slide_max_into:
+            return None
+
+        rest = 1.0 - fraction
+        slide_x = (motion_x - into * distance * normal_x) * rest
+        slide_y = (motion_y - into * distance * normal_y) * rest
+        if self.track.sweep(car.x, car.y, car.x + slide_x, car.y + slide_y) is None:
+            car.x += slide_x
+            car.y += slide_y
+
+        impact = abs(car.speed * into)
+        car.speed *= 1.0 + into
+        return impact
+
+    def _handle_powerup_collisions(self, cars, powerups):
+        if powerups is not self._hashed_powerups:
+            self._hashed_powerups = powerups
+            self.powerup_hash.clear()
+            self._powerup_reach = 0
+            for pu in powerups:
+                self.powerup_hash.insert(pu, pu.x, pu.y)
+                self._powerup_reach = max(self._powerup_reach, pu.radius)
+
+        for car in cars:
+            reach = self._powerup_reach + min(car.width, car.height) / 3
+            for pu in self.powerup_hash.query(car.x, car.y, reach):
+                if pu.check_collision(car):
+                    self._play_powerup_sound(pu)
+                    pu.collect(car)
+                    self.touched.append(car)
+
+    def _play_powerup_sound(self, pu):
+        if not self.sound_manager:
+            return
+        if isinstance(pu, powerup.Hazard):
+            self.sound_manager.play_power_down()
+        elif isinstance(pu, powerup.SpeedBoost):
+            self.sound_manager.play_power_up()
\ No newline at end of file
@@ -0,0 +1,59 @@
+import pygame
+
+class DirtyRectTracker:
+    """Presents a frame with pygame.display.update() on the regions that changed.
+
+    Draw calls report the screen rects they touched; a region is pushed on the
+    frame it is drawn and on the next one, so whatever moved away is cleared.
+    While the integer camera offset stays within scroll_threshold pixels of
+    the previous frame the background is unchanged and only those rects are
+    pushed; otherwise, or when the rects cover more than max_coverage of the
+    screen, the whole frame is flipped.
+    """
+
+    def __init__(self, screen_width, screen_height, scroll_threshold=0, max_coverage=0.5):
+        self.screen_rect = pygame.Rect(0, 0, screen_width, screen_height)
+        self.scroll_threshold = scroll_threshold
+        self.max_coverage = max_coverage
+        self.full_frames = 0
+        self.partial_frames = 0
+        self.pushed_area = 0
+        self._offset = None
+        self._previous = []
+
+    def invalidate(self):
+        self._offset = None
+
+    def present(self, offset, rects):
+        screen_rect = self.screen_rect
+        current = [screen_rect.clip(rect) for rect in rects if rect]
+        current = [rect for rect in current if rect]
+
+        full = self._offset is None or max(abs(offset[0] - self._offset[0]),
+                                           abs(offset[1] - self._offset[1])) > self.scroll_threshold
+        if not full:
+            dirty = self._previous + current
+            area = sum(rect.w * rect.h for rect in dirty)
+            full = area > self.max_coverage * screen_rect.w * screen_rect.h
+
+        if full:
+            pygame.display.flip()
+            self.full_frames += 1
+            self.pushed_area += screen_rect.w * screen_rect.h
+        else:
+            if dirty:
+                pygame.display.update(dirty)
+            self.partial_frames += 1
+            self.pushed_area += area
+
+        self._offset = offset
+        self._previous = current
+
+    def stats(self):
+        frames = self.full_frames + self.partial_frames
+        screen_area = self.screen_rect.w * self.screen_rect.h
+        return {
+            'full_frames': self.full_frames,
+            'partial_frames': self.partial_frames,
+            'pushed_fraction': self.pushed_area / (frames * screen_area) if frames else 0.0
+        }
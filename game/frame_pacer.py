@@ -0,0 +1,52 @@
+class FramePacer:
+    """Fixed-timestep accumulator that turns variable frame times into whole simulation steps.
+
+    At most max_steps steps run per frame; time beyond that is dropped rather
+    than simulated. alpha is the fraction of a step left in the accumulator,
+    used to interpolate poses between the last two simulation states.
+    """
+
+    def __init__(self, sim_rate, max_steps=5, target_fps=None, late_factor=1.5):
+        self.step = 1.0 / sim_rate
+        self.max_steps = max_steps
+        self.frame_budget = 1.0 / target_fps if target_fps else None
+        self.late_factor = late_factor
+        self.accumulator = 0.0
+        self.alpha = 0.0
+
+        self.frames = 0
+        self.steps = 0
+        self.late_frames = 0
+        self.dropped_frames = 0
+        self.dropped_steps = 0
+
+    def reset(self):
+        self.accumulator = 0.0
+        self.alpha = 0.0
+
+    def advance(self, frame_time):
+        self.frames += 1
+        if self.frame_budget and frame_time > self.frame_budget * self.late_factor:
+            self.late_frames += 1
+
+        self.accumulator += frame_time
+        steps = int(self.accumulator // self.step)
+        if steps > self.max_steps:
+            self.dropped_frames += 1
+            self.dropped_steps += steps - self.max_steps
+            self.accumulator -= (steps - self.max_steps) * self.step
+            steps = self.max_steps
+
+        self.accumulator = max(0.0, self.accumulator - steps * self.step)
+        self.alpha = min(1.0, self.accumulator / self.step)
+        self.steps += steps
+        return steps
+
+    def stats(self):
+        return {
+            'frames': self.frames,
+            'steps': self.steps,
+            'late_frames': self.late_frames,
+            'dropped_frames': self.dropped_frames,
+            'dropped_steps': self.dropped_steps
+        }
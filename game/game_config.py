@@ -5,10 +5,14 @@ class GameConfig:
     SCREEN_WIDTH = 1200
     SCREEN_HEIGHT = 800
     FPS = 60
+    SIM_RATE = 60
+    MAX_SIM_STEPS_PER_FRAME = 5
     TITLE = "PyRace"
 
     MAX_LAPS = 2
 
+    DIRTY_RECT_SCROLL_THRESHOLD = 0
+
     WHITE = (255, 255, 255)
     BLACK = (0, 0, 0)
     GRAY = (128, 128, 128)
@@ -20,8 +24,9 @@ class GameConfig:
     ENGINE_SOUND_MAX_INTERVAL = 15.0
 
     @staticmethod
-    def load_spawn_positions():
-        spawn_file = Path(__file__).parent.parent / "spawn_positions.json"
+    def load_spawn_positions(spawn_file=None):
+        if spawn_file is None:
+            spawn_file = Path(__file__).parent.parent / "spawn_positions.json"
 
         default_spawn = {
             "player": {"x": 2180, "y": 4700},
@@ -38,4 +43,23 @@ class GameConfig:
                 return json.load(f)
         except Exception as e:
             print(f"Błąd ładowania spawn_positions.json: {e}. Używam domyślnej pozycji.")
-            return default_spawn
\ No newline at end of file
+            return default_spawn
+
+    _checkpoints = None
+
+    @staticmethod
+    def load_checkpoints():
+        if GameConfig._checkpoints is not None:
+            return GameConfig._checkpoints
+
+        checkpoints_file = Path(__file__).parent.parent / "checkpoints.json"
+
+        try:
+            with open(checkpoints_file, 'r') as f:
+                data = json.load(f)
+            GameConfig._checkpoints = [(point["x"], point["y"]) for point in data.get("checkpoints", [])]
+        except Exception as e:
+            print(f"Ostrzeżenie: nie udało się wczytać checkpoints.json: {e}. Okrążenia bez walidacji.")
+            GameConfig._checkpoints = []
+
+        return GameConfig._checkpoints
\ No newline at end of file
@@ -0,0 +1,88 @@
+import numpy as np
+
+class LapTable:
+    """Lap state of every competitor as parallel arrays, updated in one finish-line pass.
+
+    A crossing is detected when the path a car moved along since the last
+    update intersects the finish line. The returned fractions place the
+    crossing within that interval.
+    """
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self, cars=(), names=(), humans=()):
+        self.cars = list(cars)
+        self.names = list(names)
+        self.index = {car: i for i, car in enumerate(self.cars)}
+        count = len(self.cars)
+
+        self.human = np.array(humans, dtype=bool).reshape(count)
+        self.laps = np.zeros(count, dtype=np.int32)
+        self.cooldown = np.zeros(count)
+        self.lap_start_time = np.zeros(count)
+        self.best_lap_time = np.full(count, np.nan)
+        self.finished = np.zeros(count, dtype=bool)
+        self.finish_time = np.full(count, np.nan)
+
+        self.xs = np.zeros(count)
+        self.ys = np.zeros(count)
+        self.prev_xs = np.zeros(count)
+        self.prev_ys = np.zeros(count)
+
+    def __len__(self):
+        return len(self.cars)
+
+    def _pull_positions(self):
+        for i, car in enumerate(self.cars):
+            self.xs[i] = car.x
+            self.ys[i] = car.y
+
+    def init_positions(self, race_time=0.0):
+        self._pull_positions()
+        self.prev_xs[:] = self.xs
+        self.prev_ys[:] = self.ys
+        self.lap_start_time[:] = race_time
+
+    def update(self, dt, finish_line):
+        self.cooldown -= dt
+        empty = np.empty(0, dtype=np.intp), np.empty(0)
+        if not self.cars:
+            return empty
+
+        self.prev_xs, self.xs = self.xs, self.prev_xs
+        self.prev_ys, self.ys = self.ys, self.prev_ys
+        self._pull_positions()
+
+        (x1, y1), (x2, y2) = finish_line
+        dx = x2 - x1
+        dy = y2 - y1
+        line_length_sq = dx * dx + dy * dy
+        if line_length_sq <= 0:
+            return empty
+
+        prev_rel_x = self.prev_xs - x1
+        prev_rel_y = self.prev_ys - y1
+        rel_x = self.xs - x1
+        rel_y = self.ys - y1
+        prev_cross = dx * prev_rel_y - dy * prev_rel_x
+        cross = dx * rel_y - dy * rel_x
+
+        switched = ((prev_cross > 0) != (cross > 0)) & ~self.finished
+        if not switched.any():
+            return empty
+
+        indices = np.flatnonzero(switched)
+        fractions = prev_cross[indices] / (prev_cross[indices] - cross[indices])
+        hit_x = prev_rel_x[indices] + fractions * (rel_x[indices] - prev_rel_x[indices])
+        hit_y = prev_rel_y[indices] + fractions * (rel_y[indices] - prev_rel_y[indices])
+        along = (hit_x * dx + hit_y * dy) / line_length_sq
+
+        crossed = (along >= 0.0) & (along <= 1.0) & (self.cooldown[indices] <= 0)
+        return indices[crossed], fractions[crossed]
+
+    def all_humans_finished(self):
+        if not self.cars:
+            return False
+        required = self.human if self.human.any() else np.ones(len(self.cars), dtype=bool)
+        return bool(self.finished[required].all())
@@ -0,0 +1,140 @@
+import csv
+import json
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager, nullcontext
+from pathlib import Path
+
+import pygame
+
+class FrameProfiler:
+    """Named timing scopes with rolling percentiles, an on-screen overlay and file export."""
+
+    def __init__(self, window=300, enabled=True, overlay_refresh=30):
+        self.window = window
+        self.enabled = enabled
+        self.overlay_refresh = overlay_refresh
+        self.overlay_visible = False
+
+        self.samples = {}
+        self.totals = {}
+        self.frame_start = None
+        self.frames = 0
+
+        self._disabled_scope = nullcontext()
+        self._lock = threading.Lock()
+        self._overlay_surface = None
+        self._overlay_age = 0
+        self._font = None
+
+    @contextmanager
+    def _timed(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start)
+
+    def scope(self, name):
+        if not self.enabled:
+            return self._disabled_scope
+        return self._timed(name)
+
+    def record(self, name, seconds):
+        with self._lock:
+            samples = self.samples.get(name)
+            if samples is None:
+                samples = self.samples[name] = deque(maxlen=self.window)
+                self.totals[name] = [0, 0.0, 0.0]
+            samples.append(seconds)
+            total = self.totals[name]
+            total[0] += 1
+            total[1] += seconds
+            total[2] = max(total[2], seconds)
+
+    def scope_names(self):
+        with self._lock:
+            return list(self.samples)
+
+    def begin_frame(self):
+        if self.enabled:
+            self.frame_start = time.perf_counter()
+
+    def end_frame(self):
+        if self.enabled and self.frame_start is not None:
+            self.record("frame", time.perf_counter() - self.frame_start)
+            self.frames += 1
+
+    def toggle_overlay(self):
+        self.overlay_visible = not self.overlay_visible
+        self._overlay_surface = None
+
+    def percentiles(self, name, points=(50, 95, 99)):
+        with self._lock:
+            ordered = sorted(self.samples.get(name, ()))
+        if not ordered:
+            return {point: 0.0 for point in points}
+        last = len(ordered) - 1
+        return {point: ordered[min(last, int(round(point / 100 * last)))] for point in points}
+
+    def get_summary(self):
+        summary = []
+        for name in self.scope_names():
+            with self._lock:
+                count, total, worst = self.totals[name]
+            p = self.percentiles(name)
+            summary.append({
+                'scope': name,
+                'count': count,
+                'mean_ms': total / count * 1000,
+                'p50_ms': p[50] * 1000,
+                'p95_ms': p[95] * 1000,
+                'p99_ms': p[99] * 1000,
+                'max_ms': worst * 1000
+            })
+        return summary
+
+    def export(self, path):
+        path = Path(path)
+        summary = self.get_summary()
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        if path.suffix.lower() == ".csv":
+            with open(path, 'w', newline='') as f:
+                writer = csv.DictWriter(f, fieldnames=['scope', 'count', 'mean_ms', 'p50_ms',
+                                                       'p95_ms', 'p99_ms', 'max_ms'])
+                writer.writeheader()
+                writer.writerows(summary)
+        else:
+            with open(path, 'w') as f:
+                json.dump({'frames': self.frames, 'window': self.window, 'scopes': summary}, f, indent=2)
+
+    def draw(self, surface, x=260, y=20):
+        if not self.overlay_visible or not self.samples:
+            return None
+
+        self._overlay_age -= 1
+        if self._overlay_surface is None or self._overlay_age <= 0:
+            self._overlay_surface = self._render_overlay()
+            self._overlay_age = self.overlay_refresh
+
+        return surface.blit(self._overlay_surface, (x, y))
+
+    def _render_overlay(self):
+        if self._font is None:
+            self._font = pygame.font.Font(None, 20)
+
+        lines = [f"{'scope':14s} {'p50':>6s} {'p95':>6s} {'p99':>6s}"]
+        for name in self.scope_names():
+            p = self.percentiles(name)
+            lines.append(f"{name[:14]:14s} {p[50] * 1000:6.2f} {p[95] * 1000:6.2f} {p[99] * 1000:6.2f}")
+
+        line_height = 16
+        rendered = [self._font.render(line, True, (220, 220, 220)) for line in lines]
+        width = max(text.get_width() for text in rendered) + 16
+        overlay = pygame.Surface((width, len(rendered) * line_height + 12), pygame.SRCALPHA)
+        overlay.fill((0, 0, 0, 180))
+        for i, text in enumerate(rendered):
+            overlay.blit(text, (8, 6 + i * line_height))
+        return overlay
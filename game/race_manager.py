@@ -1,11 +1,18 @@
 import math
 
+from game.checkpoints import CheckpointTracker
+from game.lap_table import LapTable
+from game.race_progress import RaceProgress
+
 class RaceManager:
     """Manages race state, lap tracking, and race results."""
 
-    def __init__(self, max_laps, sound_manager): 
+    def __init__(self, max_laps, sound_manager, checkpoints=None, track=None): 
         self.max_laps = max_laps
         self.sound_manager = sound_manager 
+        self.checkpoint_tracker = CheckpointTracker(checkpoints or [], track=track)
+        self.lap_table = LapTable()
+        self.focus_index = 0
 
         self.race_started = False
         self.countdown_active = False
@@ -14,34 +21,58 @@ class RaceManager:
         self.race_finished = False
 
         self.finish_line = None
+        self.lap_cooldown = 5.0
+        self.progress = None
+        self.standings = []
 
-        self.laps = 0
-        self.last_side = None
         self.lap_message_timer = 0
-        self.lap_cooldown_timer = 0
 
-        self.current_lap_time = 0.0
-        self.best_lap_time = None
         self.lap_timer_running = False
         self.total_race_time = 0.0
 
-        self.ai_lap_data = {}
         self.race_results = []
 
     def set_finish_line(self, finish_line):
         self.finish_line = finish_line
 
-    def init_ai_lap_data(self, ai_cars):
-        self.ai_lap_data = {}
-        for i, ai_car in enumerate(ai_cars):
-            self.ai_lap_data[ai_car] = {
-                'laps': 0,
-                'last_side': None,
-                'cooldown_timer': 0,
-                'finished': False,
-                'finish_time': None,
-                'name': f"AI {i+1}"
-            }
+    def set_racing_line(self, racing_line):
+        finish_point = None
+        if self.finish_line:
+            (x1, y1), (x2, y2) = self.finish_line
+            finish_point = ((x1 + x2) / 2, (y1 + y2) / 2)
+        self.progress = RaceProgress(racing_line, finish_point)
+
+    def init_competitors(self, human_cars, ai_cars):
+        human_cars = list(human_cars)
+        if len(human_cars) == 1:
+            names = ['PLAYER']
+        else:
+            names = [f"PLAYER {i+1}" for i in range(len(human_cars))]
+        names += [f"AI {i+1}" for i in range(len(ai_cars))]
+
+        self.lap_table.reset(human_cars + list(ai_cars), names,
+                             [True] * len(human_cars) + [False] * len(ai_cars))
+        self.focus_index = 0
+
+    def _focus_value(self, array, default):
+        if self.focus_index >= len(self.lap_table):
+            return default
+        return array[self.focus_index]
+
+    @property
+    def laps(self):
+        return int(self._focus_value(self.lap_table.laps, 0))
+
+    @property
+    def current_lap_time(self):
+        if self.focus_index >= len(self.lap_table):
+            return 0.0
+        return self.total_race_time - float(self.lap_table.lap_start_time[self.focus_index])
+
+    @property
+    def best_lap_time(self):
+        best = float(self._focus_value(self.lap_table.best_lap_time, math.nan))
+        return None if math.isnan(best) else best
 
     def start_countdown(self):
         self.countdown_active = True
@@ -49,166 +80,102 @@ class RaceManager:
         if self.sound_manager:
             self.sound_manager.play_race_counter()
 
-    def update(self, dt, player_car, ai_cars):
+    def update(self, dt):
+        table = self.lap_table
         if self.countdown_active:
             self.countdown_timer -= dt
             if self.countdown_timer <= 0:
                 self.countdown_active = False
                 self.race_started = True
                 self.lap_timer_running = True
-                self.current_lap_time = 0.0
 
-                if self.finish_line:
-                    self._initialize_last_sides(player_car, ai_cars)
+                self.checkpoint_tracker.reset(table.cars, self.total_race_time)
+                if self.progress:
+                    self.progress.reset(table.cars, self.total_race_time)
+                table.init_positions(self.total_race_time)
 
         if self.lap_timer_running:
-            self.current_lap_time += dt
             self.total_race_time += dt
 
         if self.lap_message_timer > 0:
             self.lap_message_timer -= dt
 
-        if self.lap_cooldown_timer > 0:
-            self.lap_cooldown_timer -= dt
-
-        if self.race_started and self.finish_line:
-            self._track_player_lap(player_car, dt)
-
-        if self.race_started and self.finish_line and not self.race_finished:
-            self._track_ai_laps(ai_cars, dt)
-
-    def _initialize_last_sides(self, player_car, ai_cars):
-        if not self.finish_line:
+        if not self.race_started:
             return
 
-        x1, y1 = self.finish_line[0]
-        x2, y2 = self.finish_line[1]
-        dx = x2 - x1
-        dy = y2 - y1
-
-        cross = dx * (player_car.y - y1) - dy * (player_car.x - x1)
-        self.last_side = 1 if cross > 0 else -1
-
-        for ai_car in ai_cars:
-            ai_data = self.ai_lap_data.get(ai_car)
-            if ai_data:
-                cross = dx * (ai_car.y - y1) - dy * (ai_car.x - x1)
-                ai_data['last_side'] = 1 if cross > 0 else -1
-
-    def _track_player_lap(self, player_car, dt):
-        x1, y1 = self.finish_line[0]
-        x2, y2 = self.finish_line[1]
-        car_x, car_y = player_car.x, player_car.y
-
-        dx = x2 - x1
-        dy = y2 - y1
-        line_length_sq = dx * dx + dy * dy
-
-        if line_length_sq > 0:
-            t = max(0, min(1, ((car_x - x1) * dx + (car_y - y1) * dy) / line_length_sq))
-            nearest_x = x1 + t * dx
-            nearest_y = y1 + t * dy
-
-            dist_x = car_x - nearest_x
-            dist_y = car_y - nearest_y
-            distance = math.sqrt(dist_x * dist_x + dist_y * dist_y)
-
-            crossing_threshold = 80
-
-            if distance < crossing_threshold:
-                cross = dx * (car_y - y1) - dy * (car_x - x1)
-                current_side = 1 if cross > 0 else -1
-
-                if (self.last_side is not None and
-                    self.last_side != current_side and
-                    self.lap_cooldown_timer <= 0):
-
-                    self.laps += 1
-                    self.lap_message_timer = 2.0
-                    self.lap_cooldown_timer = 5.0
-
-                    if self.lap_timer_running and self.laps > 1:
-                        if self.best_lap_time is None or self.current_lap_time < self.best_lap_time:
-                            self.best_lap_time = self.current_lap_time
-
-                    if self.laps > self.max_laps:
-                        self.race_results.append({
-                            'name': 'PLAYER',
-                            'finish_time': self.total_race_time,
-                            'position': None
-                        })
-
-                        self._finalize_ai_results()
-                        self.finish_race()
-
-                    self.current_lap_time = 0.0
-
-                self.last_side = current_side
-
-    def _track_ai_laps(self, ai_cars, dt):
-        if not self.finish_line:
+        for car in table.cars:
+            self.checkpoint_tracker.update(car, self.total_race_time)
+        if self.progress:
+            self.progress.update(table.cars, self.total_race_time)
+        self.standings = self.get_positions()
+
+        if self.finish_line:
+            indices, fractions = table.update(dt, self.finish_line)
+            for index, fraction in zip(indices, fractions):
+                crossing_time = self.total_race_time - (1.0 - float(fraction)) * dt
+                self._complete_lap(int(index), crossing_time)
+
+            if table.all_humans_finished():
+                self._finalize_results()
+                self.finish_race()
+
+    def _complete_lap(self, index, crossing_time):
+        table = self.lap_table
+        car = table.cars[index]
+        laps = int(table.laps[index])
+        if laps > 0 and not self.checkpoint_tracker.is_lap_complete(car):
             return
 
-        x1, y1 = self.finish_line[0]
-        x2, y2 = self.finish_line[1]
-        dx = x2 - x1
-        dy = y2 - y1
-        line_length_sq = dx * dx + dy * dy
-
-        for ai_car in ai_cars:
-            ai_data = self.ai_lap_data.get(ai_car)
-            if not ai_data or ai_data['finished']:
+        laps += 1
+        table.laps[index] = laps
+        table.cooldown[index] = self.lap_cooldown
+        self.checkpoint_tracker.start_lap(car, crossing_time, completed=laps > 1)
+
+        lap_time = crossing_time - table.lap_start_time[index]
+        best = table.best_lap_time[index]
+        if laps > 1 and (math.isnan(best) or lap_time < best):
+            table.best_lap_time[index] = lap_time
+        table.lap_start_time[index] = crossing_time
+
+        if index == self.focus_index:
+            self.lap_message_timer = 2.0
+
+        if laps > self.max_laps:
+            table.finished[index] = True
+            table.finish_time[index] = crossing_time
+
+    def _finalize_results(self):
+        table = self.lap_table
+        race_distance = self.progress.total_length * self.max_laps if self.progress else 0.0
+        last_estimate = self.total_race_time
+
+        for index in range(len(table)):
+            if table.finished[index]:
+                self.race_results.append({
+                    'name': table.names[index],
+                    'finish_time': float(table.finish_time[index]),
+                    'position': None
+                })
+
+        for entry in self.standings or self.get_positions():
+            index = table.index[entry['car']]
+            if table.finished[index]:
                 continue
 
-            if ai_data['cooldown_timer'] > 0:
-                ai_data['cooldown_timer'] -= dt
-
-            car_x, car_y = ai_car.x, ai_car.y
-
-            if line_length_sq > 0:
-                t = max(0, min(1, ((car_x - x1) * dx + (car_y - y1) * dy) / line_length_sq))
-                nearest_x = x1 + t * dx
-                nearest_y = y1 + t * dy
-
-                dist_x = car_x - nearest_x
-                dist_y = car_y - nearest_y
-                distance = math.sqrt(dist_x * dist_x + dist_y * dist_y)
-
-                crossing_threshold = 80
-
-                if distance < crossing_threshold:
-                    cross = dx * (car_y - y1) - dy * (car_x - x1)
-                    current_side = 1 if cross > 0 else -1
-
-                    if (ai_data['last_side'] is not None and
-                        ai_data['last_side'] != current_side and
-                        ai_data['cooldown_timer'] <= 0):
-
-                        ai_data['laps'] += 1
-                        ai_data['cooldown_timer'] = 5.0
-
-                        if ai_data['laps'] > self.max_laps:
-                            ai_data['finished'] = True
-                            ai_data['finish_time'] = self.total_race_time
-
-                    ai_data['last_side'] = current_side
-
-    def _finalize_ai_results(self):
-        for ai_car in self.ai_lap_data:
-            ai_data = self.ai_lap_data.get(ai_car)
-            if not ai_data:
-                continue
-
-            if ai_data['finished'] and ai_data['finish_time'] is not None:
-                finish_time = ai_data['finish_time']
+            if self.progress:
+                distance = self.progress.get_progress(entry['car'])
+                remaining = max(0.0, race_distance - distance)
+                if distance > 0 and self.total_race_time > 0:
+                    estimate = self.total_race_time + remaining * self.total_race_time / distance
+                else:
+                    estimate = self.total_race_time + self.max_laps * 60.0
+                finish_time = last_estimate = max(estimate, last_estimate)
             else:
-                laps_completed = ai_data['laps']
-                laps_behind = self.max_laps - laps_completed
-                penalty_time = max(0, laps_behind) * 60.0
-                finish_time = self.total_race_time + penalty_time
+                laps_behind = self.max_laps - int(table.laps[index])
+                finish_time = self.total_race_time + max(0, laps_behind) * 60.0
 
             self.race_results.append({
-                'name': ai_data['name'],
+                'name': table.names[index],
                 'finish_time': finish_time,
                 'position': None
             })
@@ -229,18 +196,50 @@ class RaceManager:
         self.countdown_timer = 0.0
         self.race_finished = False
 
-        self.laps = 0
-        self.last_side = None
         self.lap_message_timer = 0
-        self.lap_cooldown_timer = 0
 
-        self.current_lap_time = 0.0
-        self.best_lap_time = None
         self.lap_timer_running = False
         self.total_race_time = 0.0
 
         self.race_results = []
-        self.ai_lap_data = {}
+        self.standings = []
+        self.lap_table.reset()
+        self.checkpoint_tracker.reset([])
+        if self.progress:
+            self.progress.reset([])
+
+    def get_positions(self):
+        table = self.lap_table
+        standings = []
+        for index, car in enumerate(table.cars):
+            standings.append({
+                'name': table.names[index],
+                'car': car,
+                'laps': int(table.laps[index]),
+                'finish_time': float(table.finish_time[index]) if table.finished[index] else None
+            })
+
+        def sort_key(entry):
+            if entry['finish_time'] is not None:
+                return (1, -entry['finish_time'], 0, 0.0)
+            if self.progress:
+                return (0, entry['laps'], self.progress.get_progress(entry['car']), 0.0)
+            checkpoint, closeness = self.checkpoint_tracker.get_progress(entry['car'])
+            return (0, entry['laps'], checkpoint, closeness)
+
+        standings.sort(key=sort_key, reverse=True)
+        leader_time = standings[0]['finish_time'] if standings else None
+        for i, entry in enumerate(standings):
+            entry['position'] = i + 1
+            if entry['finish_time'] is not None:
+                entry['gap'] = entry['finish_time'] - leader_time
+            elif i == 0:
+                entry['gap'] = 0.0
+            elif self.progress:
+                entry['gap'] = self.progress.get_gap(entry['car'], self.total_race_time)
+            else:
+                entry['gap'] = None
+        return standings
 
     def is_race_active(self):
         return self.race_started and not self.race_finished
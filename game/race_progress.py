@@ -0,0 +1,124 @@
+from components.racing_line import RacingLine
+
+class ProgressState:
+    __slots__ = ('hint', 'arc', 'progress')
+
+    def __init__(self, hint, arc, progress):
+        self.hint = hint
+        self.arc = arc
+        self.progress = progress
+
+class RaceProgress:
+    """Projects cars onto the racing line to measure distance raced and gap times.
+
+    Arc length is measured from the finish line along the racing line.
+    Progress is unwrapped across laps, so driving backwards loses
+    distance. Each car keeps the segment it was last projected onto, so
+    a projection searches only a few segments around it.
+    """
+
+    def __init__(self, racing_line, finish_point=None, bucket_length=50.0, search_window=3,
+                 rescan_distance=400.0):
+        if not isinstance(racing_line, RacingLine):
+            racing_line = RacingLine(racing_line)
+
+        self.racing_line = racing_line
+        self.bucket_length = bucket_length
+        self.search_window = search_window
+        self.rescan_distance_sq = rescan_distance * rescan_distance
+
+        points = racing_line.points
+        dx = racing_line.deltas[:, 0]
+        dy = racing_line.deltas[:, 1]
+        self.segments = list(zip(points[:, 0].tolist(), points[:, 1].tolist(), dx.tolist(), dy.tolist(),
+                                 (dx * dx + dy * dy).tolist(), racing_line.segment_lengths.tolist()))
+        self.cumulative = racing_line.cumulative.tolist()
+        self.total_length = racing_line.total_length
+
+        self.start_arc = 0.0
+        if finish_point is not None and self.segments:
+            self.start_arc = self._full_scan(*finish_point)[2]
+
+        self.states = {}
+        self.passing_times = []
+
+    def _project(self, index, x, y):
+        x1, y1, dx, dy, length_sq, segment_length = self.segments[index]
+        if length_sq > 0:
+            t = max(0.0, min(1.0, ((x - x1) * dx + (y - y1) * dy) / length_sq))
+        else:
+            t = 0.0
+        near_x = x1 + t * dx - x
+        near_y = y1 + t * dy - y
+        return near_x * near_x + near_y * near_y, self.cumulative[index] + t * segment_length
+
+    def _full_scan(self, x, y):
+        best = (float('inf'), 0, 0.0)
+        for index in range(len(self.segments)):
+            dist_sq, arc = self._project(index, x, y)
+            if dist_sq < best[0]:
+                best = (dist_sq, index, arc)
+        return best
+
+    def locate(self, x, y, hint=None):
+        if hint is None:
+            return self._full_scan(x, y)
+
+        count = len(self.segments)
+        best = (float('inf'), hint, 0.0)
+        for offset in range(-1, self.search_window + 1):
+            index = (hint + offset) % count
+            dist_sq, arc = self._project(index, x, y)
+            if dist_sq < best[0]:
+                best = (dist_sq, index, arc)
+
+        if best[0] > self.rescan_distance_sq:
+            return self._full_scan(x, y)
+        return best
+
+    def reset(self, cars, race_time=0.0):
+        self.states = {}
+        self.passing_times = []
+        for car in cars:
+            _, hint, arc = self.locate(car.x, car.y)
+            arc = (arc - self.start_arc) % self.total_length
+            progress = arc - self.total_length if arc > self.total_length / 2 else arc
+            self.states[car] = ProgressState(hint, arc, progress)
+
+    def update(self, cars, race_time):
+        if not self.segments:
+            return
+
+        total_length = self.total_length
+        half_length = total_length / 2
+        for car in cars:
+            state = self.states.get(car)
+            if state is None:
+                continue
+
+            _, state.hint, arc = self.locate(car.x, car.y, state.hint)
+            arc = (arc - self.start_arc) % total_length
+            delta = arc - state.arc
+            if delta < -half_length:
+                delta += total_length
+            elif delta > half_length:
+                delta -= total_length
+            state.arc = arc
+            state.progress += delta
+
+            bucket = int(state.progress // self.bucket_length)
+            while len(self.passing_times) <= bucket:
+                self.passing_times.append(race_time)
+
+    def get_progress(self, car):
+        state = self.states.get(car)
+        return state.progress if state is not None else 0.0
+
+    def get_gap(self, car, race_time):
+        state = self.states.get(car)
+        if state is None:
+            return 0.0
+        bucket = int(state.progress // self.bucket_length)
+        if bucket < 0 or bucket >= len(self.passing_times):
+            return 0.0
+        return race_time - self.passing_times[bucket]
@@ -0,0 +1,223 @@
+import json
+import struct
+import time
+
+import pygame
+
+from game.simulation import RaceSimulation
+
+MAGIC = b"PYRACE"
+VERSION = 1
+
+INPUT_ACCELERATE = 0x01
+INPUT_REVERSE = 0x02
+INPUT_LEFT = 0x04
+INPUT_RIGHT = 0x08
+INPUT_BRAKE = 0x10
+COMMAND_START = 0x40
+
+RECORD_RESET = 0xFF
+RECORD_RESULTS = 0xFE
+
+KEY_BITS = {
+    pygame.K_UP: INPUT_ACCELERATE,
+    pygame.K_w: INPUT_ACCELERATE,
+    pygame.K_DOWN: INPUT_REVERSE,
+    pygame.K_s: INPUT_REVERSE,
+    pygame.K_LEFT: INPUT_LEFT,
+    pygame.K_a: INPUT_LEFT,
+    pygame.K_RIGHT: INPUT_RIGHT,
+    pygame.K_d: INPUT_RIGHT,
+    pygame.K_SPACE: INPUT_BRAKE
+}
+
+HEADER = struct.Struct("<6sBI")
+TICK = struct.Struct("<Bd")
+RESET = struct.Struct("<Bq")
+RESULTS = struct.Struct("<BI")
+
+def encode_keys(keys):
+    bits = 0
+    for key, bit in KEY_BITS.items():
+        if keys[key]:
+            bits |= bit
+    return bits
+
+class InputState:
+    """Key state decoded from a replay, indexable like pygame.key.get_pressed()."""
+
+    __slots__ = ('bits',)
+
+    def __init__(self, bits=0):
+        self.bits = bits
+
+    def __getitem__(self, key):
+        return bool(self.bits & KEY_BITS.get(key, 0))
+
+class ReplayWriter:
+    """Streams per-tick inputs and dt of a RaceSimulation to a binary file."""
+
+    def __init__(self, path, simulation, buffer_size=1 << 16):
+        self.file = open(path, 'wb')
+        self.buffer = bytearray(buffer_size)
+        self.offset = 0
+        self.ticks = 0
+
+        metadata = json.dumps({
+            'spawn_data': simulation.spawn_data,
+            'max_laps': simulation.race_manager.max_laps,
+            'player_autopilot': simulation.player_autopilot,
+            'player_ai_speed': simulation.player_ai_speed,
+            'physics': simulation.physics,
+            'track_collision': simulation.track_collision
+        }).encode('utf-8')
+        self.file.write(HEADER.pack(MAGIC, VERSION, len(metadata)))
+        self.file.write(metadata)
+        self.record_reset(simulation.seed)
+
+    def _reserve(self, size):
+        if self.offset + size > len(self.buffer):
+            self.flush()
+
+    def record_tick(self, dt, input_bits, commands=0):
+        self._reserve(TICK.size)
+        TICK.pack_into(self.buffer, self.offset, input_bits | commands, dt)
+        self.offset += TICK.size
+        self.ticks += 1
+
+    def record_reset(self, seed):
+        self._reserve(RESET.size)
+        RESET.pack_into(self.buffer, self.offset, RECORD_RESET, seed)
+        self.offset += RESET.size
+
+    def record_results(self, race_results):
+        payload = json.dumps(race_results).encode('utf-8')
+        self.flush()
+        self.file.write(RESULTS.pack(RECORD_RESULTS, len(payload)))
+        self.file.write(payload)
+
+    def flush(self):
+        if self.offset:
+            self.file.write(memoryview(self.buffer)[:self.offset])
+            self.offset = 0
+
+    def close(self):
+        if self.file.closed:
+            return
+        self.flush()
+        self.file.close()
+
+class ReplayReader:
+    """Iterates the records of a replay file: ('tick', bits, dt), ('reset', seed) and ('results', list)."""
+
+    def __init__(self, path):
+        with open(path, 'rb') as f:
+            self.data = f.read()
+
+        magic, version, metadata_length = HEADER.unpack_from(self.data, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"Nieobsługiwany plik powtórki: {path}")
+
+        start = HEADER.size
+        self.metadata = json.loads(self.data[start:start + metadata_length].decode('utf-8'))
+        self.records_offset = start + metadata_length
+
+    def __iter__(self):
+        data = self.data
+        offset = self.records_offset
+        end = len(data)
+
+        while offset < end:
+            kind = data[offset]
+            if kind == RECORD_RESET:
+                yield 'reset', RESET.unpack_from(data, offset)[1]
+                offset += RESET.size
+            elif kind == RECORD_RESULTS:
+                length = RESULTS.unpack_from(data, offset)[1]
+                offset += RESULTS.size
+                yield 'results', json.loads(data[offset:offset + length].decode('utf-8'))
+                offset += length
+            else:
+                bits, dt = TICK.unpack_from(data, offset)
+                yield 'tick', bits, dt
+                offset += TICK.size
+
+class ReplayPlayer:
+    """Re-simulates a recorded race tick by tick, either inside the game or headless.
+
+    on_reset, if given, is called with the seed of every recorded reset, so
+    state seeded alongside the simulation (e.g. the camera shake) can follow.
+    """
+
+    def __init__(self, path, track, sound_manager=None, effect_manager=None, profiler=None,
+                 on_reset=None):
+        self.reader = ReplayReader(path)
+        metadata = self.reader.metadata
+
+        self.simulation = RaceSimulation(
+            track, sound_manager, effect_manager,
+            spawn_data=metadata['spawn_data'],
+            max_laps=metadata['max_laps'],
+            player_autopilot=metadata['player_autopilot'],
+            player_ai_speed=metadata['player_ai_speed'],
+            physics=metadata['physics'],
+            profiler=profiler,
+            track_collision=metadata.get('track_collision', "point")
+        )
+        self.records = iter(self.reader)
+        self.on_reset = on_reset
+        self.input_state = InputState()
+        self.recorded_results = None
+        self.finished = False
+
+    def step(self):
+        for record in self.records:
+            kind = record[0]
+            if kind == 'reset':
+                self.simulation.reset(record[1])
+                if self.on_reset:
+                    self.on_reset(record[1])
+            elif kind == 'results':
+                self.recorded_results = record[1]
+            else:
+                bits, dt = record[1], record[2]
+                if bits & COMMAND_START:
+                    self.simulation.race_manager.start_countdown()
+                self.input_state.bits = bits
+                return self.simulation.step(dt, self.input_state)
+
+        self.finished = True
+        return 0
+
+    def run(self):
+        start = time.perf_counter()
+        while not self.finished:
+            self.step()
+        elapsed = time.perf_counter() - start
+
+        stats = self.simulation.get_stats()
+        stats['replay_wall_time'] = elapsed
+        stats['recorded_results'] = self.recorded_results
+        stats['verified'] = (self.recorded_results is not None and
+                             self.recorded_results == stats['results'])
+        return stats
+
+def record_headless_race(simulation, path, dt, max_sim_time=600.0):
+    writer = ReplayWriter(path, simulation)
+    commands = 0
+    if not simulation.race_manager.race_started and not simulation.race_manager.is_countdown_active():
+        simulation.race_manager.start_countdown()
+        commands = COMMAND_START
+
+    try:
+        while not simulation.race_manager.is_race_finished() and simulation.sim_time < max_sim_time:
+            writer.record_tick(dt, 0, commands)
+            commands = 0
+            simulation.step(dt)
+
+        if simulation.race_manager.is_race_finished():
+            writer.record_results(simulation.race_manager.race_results)
+    finally:
+        writer.close()
+
+    return simulation.get_stats()
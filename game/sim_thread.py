@@ -0,0 +1,42 @@
+import threading
+import time
+
+from game.world_snapshot import SnapshotBuffer
+
+class SimulationThread(threading.Thread):
+    """Steps the game at its fixed simulation rate off the main thread.
+
+    After each batch of steps a WorldSnapshot is published to the double
+    buffer for the render loop. Commands and key state still come from
+    the main thread, which owns the window and the event queue. An
+    exception stops the thread and is kept in error for the main thread
+    to re-raise.
+    """
+
+    def __init__(self, game):
+        super().__init__(name="simulation", daemon=True)
+        self.game = game
+        self.buffer = SnapshotBuffer()
+        self.error = None
+        self._stopping = threading.Event()
+
+    def stop(self):
+        self._stopping.set()
+
+    def run(self):
+        game = self.game
+        pacer = game.pacer
+        last = time.perf_counter()
+        try:
+            self.buffer.publish(game.capture(last))
+            while not self._stopping.is_set():
+                now = time.perf_counter()
+                steps = pacer.advance(now - last)
+                last = now
+                for _ in range(steps):
+                    game.update()
+                if steps:
+                    self.buffer.publish(game.capture(now - pacer.accumulator))
+                self._stopping.wait(max(0.0, pacer.step - pacer.accumulator))
+        except Exception as error:
+            self.error = error
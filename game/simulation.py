@@ -0,0 +1,215 @@
+import math
+import random
+import time
+
+from components.car import Car
+from components.ai_car import AICar
+from components import powerup
+from game.game_config import GameConfig
+from game.race_manager import RaceManager
+from game.collision_manager import CollisionManager
+from game.profiler import FrameProfiler
+from game.vector_physics import VectorPhysics
+
+class RaceSimulation:
+    """Race world stepped with an explicit dt: cars, power-ups, collisions and lap tracking."""
+
+    def __init__(self, track, sound_manager=None, effect_manager=None, spawn_data=None,
+                 seed=None, max_laps=GameConfig.MAX_LAPS, player_autopilot=False,
+                 player_ai_speed=400, physics="scalar", profiler=None, track_collision="point"):
+        self.track = track
+        self.sound_manager = sound_manager
+        self.effect_manager = effect_manager
+        self.spawn_data = spawn_data if spawn_data is not None else GameConfig.load_spawn_positions()
+        self.base_seed = seed
+        self.seed = None
+        self.rng = random.Random()
+        self.player_autopilot = player_autopilot
+        self.player_ai_speed = player_ai_speed
+        self.physics = physics
+        self.track_collision = track_collision
+        self.vector_physics = None
+        self.profiler = profiler if profiler is not None else FrameProfiler(enabled=False)
+
+        self.race_manager = RaceManager(max_laps, sound_manager, GameConfig.load_checkpoints(), track)
+        self.collision_manager = CollisionManager(track, effect_manager, sound_manager, rng=self.rng,
+                                                  track_mode=track_collision)
+
+        self.player_car = None
+        self.ai_cars = []
+        self.powerups = []
+
+        self.sim_time = 0.0
+        self.wall_time = 0.0
+        self.ticks = 0
+
+        self.reset()
+
+    def reset(self, seed=None):
+        if seed is None:
+            seed = self.base_seed if self.base_seed is not None else random.randrange(1 << 62)
+        self.seed = seed
+
+        self.race_manager.reset()
+        self.rng.seed(seed)
+
+        self._load_spawn_positions()
+        if self.physics == "vector":
+            self.vector_physics = VectorPhysics([self.player_car] + self.ai_cars)
+        self.powerups = powerup.spawn_powerups_on_track(self.track, num_hazards=8, num_boosts=5,
+                                                        rng=self.rng)
+
+        self.sim_time = 0.0
+        self.wall_time = 0.0
+        self.ticks = 0
+
+    def _load_spawn_positions(self):
+        spawn_data = self.spawn_data
+        racing_line = self.track.get_racing_line()
+
+        player_data = spawn_data["player"]
+        if self.player_autopilot:
+            self.player_car = AICar(player_data["x"], player_data["y"], racing_line,
+                                    color=GameConfig.RED, ai_speed=self.player_ai_speed,
+                                    track=self.track)
+        else:
+            self.player_car = Car(player_data["x"], player_data["y"], color=GameConfig.RED)
+
+        finish_data = spawn_data.get("finish_line")
+        if finish_data:
+            finish_line = [
+                (finish_data["x1"], finish_data["y1"]),
+                (finish_data["x2"], finish_data["y2"])
+            ]
+            self.race_manager.set_finish_line(finish_line)
+        self.race_manager.set_racing_line(racing_line)
+
+        self.ai_cars = []
+
+        for ai_data in spawn_data.get("ai_cars", []):
+            ai_car = AICar(
+                ai_data["x"],
+                ai_data["y"],
+                racing_line,
+                color=tuple(ai_data["color"]),
+                ai_speed=ai_data["speed"],
+                racing_line_offset=ai_data["offset"],
+                sprite_name=ai_data.get("sprite", "bolid.png"),
+                track=self.track
+            )
+            self.ai_cars.append(ai_car)
+
+        self._set_starting_angles()
+        self.race_manager.init_competitors([self.player_car], self.ai_cars)
+
+    def _set_starting_angles(self):
+        if not self.race_manager.finish_line:
+            self.player_car.angle = 0
+            for ai_car in self.ai_cars:
+                ai_car.angle = 0
+            return
+
+        x1, y1 = self.race_manager.finish_line[0]
+        x2, y2 = self.race_manager.finish_line[1]
+
+        dx = x2 - x1
+        dy = y2 - y1
+
+        line_angle_rad = math.atan2(dy, dx)
+        perp_angle_rad = line_angle_rad + math.pi / 2
+        perp_angle_deg = math.degrees(perp_angle_rad)
+        game_angle = 90 - perp_angle_deg
+        game_angle = game_angle % 360
+
+        racing_line = self.track.get_racing_line()
+        if racing_line and len(racing_line) > 0:
+            first_waypoint = racing_line[0]
+            wx, wy = first_waypoint
+
+            angle1 = game_angle
+            angle2 = (game_angle + 180) % 360
+
+            player_x, player_y = self.player_car.x, self.player_car.y
+
+            dx1 = wx - player_x
+            dy1 = wy - player_y
+            angle1_rad = math.radians(angle1)
+            forward1_x = math.sin(angle1_rad)
+            forward1_y = -math.cos(angle1_rad)
+            dot1 = dx1 * forward1_x + dy1 * forward1_y
+
+            angle2_rad = math.radians(angle2)
+            forward2_x = math.sin(angle2_rad)
+            forward2_y = -math.cos(angle2_rad)
+            dot2 = dx1 * forward2_x + dy1 * forward2_y
+
+            if dot2 > dot1:
+                game_angle = angle2
+
+        self.player_car.angle = game_angle
+        for ai_car in self.ai_cars:
+            ai_car.angle = game_angle
+
+    def step(self, dt, keys=None):
+        start = time.perf_counter()
+        profiler = self.profiler
+
+        with profiler.scope("race_manager"):
+            self.race_manager.update(dt)
+        race_active = self.race_manager.is_race_active()
+
+        with profiler.scope("cars"):
+            if not self.player_autopilot and race_active and keys is not None:
+                self.player_car.handle_input(keys, dt)
+                if self.vector_physics:
+                    self.vector_physics.mark_dirty([self.player_car])
+
+            if self.vector_physics:
+                active = [race_active or not self.player_autopilot] + [race_active] * len(self.ai_cars)
+                self.vector_physics.pull()
+                self.vector_physics.step(dt, active)
+                self.vector_physics.push()
+            else:
+                if race_active or not self.player_autopilot:
+                    self.player_car.update(dt)
+
+                for ai_car in self.ai_cars:
+                    if race_active:
+                        ai_car.update(dt)
+
+        with profiler.scope("powerups"):
+            for pu in self.powerups:
+                pu.update(dt)
+
+        with profiler.scope("collisions"):
+            camera_shake = self.collision_manager.update(self.player_car, self.ai_cars, self.powerups)
+            if self.vector_physics:
+                self.vector_physics.mark_dirty(self.collision_manager.touched)
+
+        if self.effect_manager:
+            with profiler.scope("effects"):
+                self.effect_manager.update(dt)
+
+        self.sim_time += dt
+        self.ticks += 1
+        self.wall_time += time.perf_counter() - start
+        return camera_shake
+
+    def run_until_finished(self, dt=1.0 / GameConfig.SIM_RATE, max_sim_time=600.0):
+        if not self.race_manager.race_started and not self.race_manager.is_countdown_active():
+            self.race_manager.start_countdown()
+
+        while not self.race_manager.is_race_finished() and self.sim_time < max_sim_time:
+            self.step(dt)
+
+        return self.get_stats()
+
+    def get_stats(self):
+        return {
+            'finished': self.race_manager.is_race_finished(),
+            'results': [dict(result) for result in self.race_manager.race_results],
+            'ticks': self.ticks,
+            'sim_time': self.sim_time,
+            'wall_time': self.wall_time,
+            'sim_speed': self.sim_time / self.wall_time if self.wall_time > 0 else 0.0
+        }
@@ -0,0 +1,44 @@
+class SpatialHash:
+    """Uniform grid of buckets used as a broadphase for proximity checks."""
+
+    HALF_NEIGHBOURS = ((1, 0), (-1, 1), (0, 1), (1, 1))
+
+    def __init__(self, cell_size):
+        self.cell_size = cell_size
+        self.cells = {}
+
+    def clear(self):
+        self.cells.clear()
+
+    def insert(self, item, x, y):
+        key = (int(x // self.cell_size), int(y // self.cell_size))
+        bucket = self.cells.get(key)
+        if bucket is None:
+            self.cells[key] = [item]
+        else:
+            bucket.append(item)
+
+    def candidate_pairs(self):
+        for (cell_x, cell_y), bucket in self.cells.items():
+            for i in range(len(bucket)):
+                for j in range(i + 1, len(bucket)):
+                    yield bucket[i], bucket[j]
+
+            for offset_x, offset_y in self.HALF_NEIGHBOURS:
+                other = self.cells.get((cell_x + offset_x, cell_y + offset_y))
+                if other:
+                    for item in bucket:
+                        for other_item in other:
+                            yield item, other_item
+
+    def query(self, x, y, radius):
+        min_x = int((x - radius) // self.cell_size)
+        max_x = int((x + radius) // self.cell_size)
+        min_y = int((y - radius) // self.cell_size)
+        max_y = int((y + radius) // self.cell_size)
+
+        for cell_y in range(min_y, max_y + 1):
+            for cell_x in range(min_x, max_x + 1):
+                bucket = self.cells.get((cell_x, cell_y))
+                if bucket:
+                    yield from bucket
@@ -0,0 +1,241 @@
+import numpy as np
+
+from components.ai_car import AICar
+
+class VectorPhysics:
+    """Struct-of-arrays physics for a whole field of cars.
+
+    The arrays are the source of truth during step(); Car/AICar objects are
+    synced views that pull() reads before a step and push() writes after it,
+    so input handling, collisions, power-ups, rendering and the HUD keep
+    working on plain car attributes.
+    """
+
+    def __init__(self, cars):
+        self.cars = list(cars)
+        count = len(self.cars)
+
+        self.x = np.zeros(count)
+        self.y = np.zeros(count)
+        self.prev_x = np.zeros(count)
+        self.prev_y = np.zeros(count)
+        self.angle = np.zeros(count)
+        self.speed = np.zeros(count)
+        self.stunned = np.zeros(count, dtype=bool)
+        self.stun_timer = np.zeros(count)
+        self.stun_reverse_speed = np.zeros(count)
+
+        self.boost_timer = np.zeros(count)
+        self.boost_factor = np.ones(count)
+        self.slow_timer = np.zeros(count)
+        self.slow_factor = np.ones(count)
+
+        self.acceleration = np.array([car.acceleration for car in self.cars], dtype=float)
+        self.friction = np.array([car.friction for car in self.cars], dtype=float)
+        self.brake_force = np.array([car.brake_force for car in self.cars], dtype=float)
+        self.turn_speed = np.array([car.turn_speed for car in self.cars], dtype=float)
+
+        self.is_ai = np.array([isinstance(car, AICar) and bool(car.waypoints) for car in self.cars],
+                              dtype=bool)
+        self.ai_base_speed = np.array([car.ai_base_speed if isinstance(car, AICar) else 0
+                                       for car in self.cars], dtype=float)
+        self.waypoint_threshold = np.array([car.waypoint_threshold if isinstance(car, AICar) else 0
+                                            for car in self.cars], dtype=float)
+        self.waypoint_threshold_sq = self.waypoint_threshold ** 2
+
+        max_waypoints = max([len(car.waypoints) for car in self.cars if isinstance(car, AICar)] + [1])
+        self.waypoints = np.zeros((count, max_waypoints, 2))
+        self.waypoint_count = np.ones(count, dtype=np.int64)
+        for i, car in enumerate(self.cars):
+            if self.is_ai[i]:
+                self.waypoints[i, :len(car.waypoints)] = car.waypoints
+                self.waypoint_count[i] = len(car.waypoints)
+        self.current_waypoint = np.zeros(count, dtype=np.int64)
+        self.ai_target_speed = self.ai_base_speed.copy()
+
+        self.track = next((car.track for car in self.cars
+                           if isinstance(car, AICar) and car.track is not None), None)
+        self.avoids_walls = np.array([isinstance(car, AICar) and car.track is not None
+                                      for car in self.cars], dtype=bool)
+        self.wall_avoid_distance = np.array([car.wall_avoid_distance if isinstance(car, AICar) else 1
+                                             for car in self.cars], dtype=float)
+        self.wall_avoid_strength = np.array([car.wall_avoid_strength if isinstance(car, AICar) else 0
+                                             for car in self.cars], dtype=float)
+
+        self._rows = np.arange(count)
+        self._index = {id(car): i for i, car in enumerate(self.cars)}
+        self._dirty = set(range(count))
+        self._moved = np.zeros(count, dtype=bool)
+
+    def mark_dirty(self, cars):
+        for car in cars:
+            self._dirty.add(self._index[id(car)])
+
+    def pull(self):
+        if not self._dirty:
+            return
+
+        for i in self._dirty:
+            car = self.cars[i]
+            self.x[i] = car.x
+            self.y[i] = car.y
+            self.prev_x[i] = car.prev_x
+            self.prev_y[i] = car.prev_y
+            self.angle[i] = car.angle
+            self.speed[i] = car.speed
+            self.stunned[i] = car.stunned
+            self.stun_timer[i] = car.stun_timer
+            self.stun_reverse_speed[i] = car.stun_reverse_speed
+            self.current_waypoint[i] = getattr(car, 'current_waypoint', 0)
+
+            self.boost_timer[i] = 0.0
+            self.slow_timer[i] = 0.0
+            for effect in car.active_effects:
+                if effect['type'] == 'boost':
+                    self.boost_timer[i] = effect['timer']
+                    self.boost_factor[i] = effect['factor']
+                elif effect['type'] == 'slow':
+                    self.slow_timer[i] = effect['timer']
+                    self.slow_factor[i] = effect['factor']
+        self._dirty.clear()
+
+    def push(self):
+        rows = np.flatnonzero(self._moved).tolist()
+        if not rows:
+            return
+
+        x = self.x.tolist()
+        y = self.y.tolist()
+        prev_x = self.prev_x.tolist()
+        prev_y = self.prev_y.tolist()
+        angle = self.angle.tolist()
+        speed = self.speed.tolist()
+        stunned = self.stunned.tolist()
+        stun_timer = self.stun_timer.tolist()
+
+        for i in rows:
+            car = self.cars[i]
+            car.x = x[i]
+            car.y = y[i]
+            car.prev_x = prev_x[i]
+            car.prev_y = prev_y[i]
+            car.angle = angle[i]
+            car.speed = speed[i]
+            car.stunned = stunned[i]
+            car.stun_timer = stun_timer[i]
+            if self.is_ai[i]:
+                car.current_waypoint = int(self.current_waypoint[i])
+                car.ai_target_speed = float(self.ai_target_speed[i])
+
+            if car.active_effects:
+                timers = {'boost': float(self.boost_timer[i]), 'slow': float(self.slow_timer[i])}
+                car.active_effects = [{**effect, 'timer': timers[effect['type']]}
+                                      for effect in car.active_effects
+                                      if timers.get(effect['type'], 0.0) > 0]
+
+    def step(self, dt, active):
+        active = np.asarray(active, dtype=bool)
+        self._moved = active
+
+        effect_multiplier = None
+        if self.boost_timer.any() or self.slow_timer.any():
+            boost_active = self.boost_timer > dt
+            slow_active = self.slow_timer > dt
+            self.boost_timer = np.where(active & boost_active, self.boost_timer - dt,
+                                        np.where(active, 0.0, self.boost_timer))
+            self.slow_timer = np.where(active & slow_active, self.slow_timer - dt,
+                                       np.where(active, 0.0, self.slow_timer))
+            effect_multiplier = (np.where(boost_active, self.boost_factor, 1.0) *
+                                 np.where(slow_active, self.slow_factor, 1.0))
+
+        stunned = active & self.stunned
+        navigating = active & self.is_ai & ~self.stunned
+
+        if stunned.any():
+            self.stun_timer[stunned] -= dt
+            self.speed[stunned] = self.stun_reverse_speed[stunned]
+            recovered = stunned & (self.stun_timer <= 0)
+            self.stunned[recovered] = False
+            self.stun_timer[recovered] = 0.0
+            self.speed[recovered] = 0.0
+
+        if navigating.any():
+            self._navigate(dt, navigating, effect_multiplier)
+
+        self.prev_x[active] = self.x[active]
+        self.prev_y[active] = self.y[active]
+        angle_rad = np.radians(self.angle[active])
+        self.x[active] += np.sin(angle_rad) * self.speed[active] * dt
+        self.y[active] -= np.cos(angle_rad) * self.speed[active] * dt
+
+    @staticmethod
+    def _wrap_degrees(diff):
+        if not (np.abs(diff) > 180).any():
+            return diff
+        # Same result as the scalar `while diff > 180: diff -= 360` loops, including at exactly +-180.
+        turns = np.where(diff > 180, np.ceil((diff - 180) / 360),
+                         np.where(diff < -180, -np.ceil((-180 - diff) / 360), 0.0))
+        diff = diff - turns * 360
+        diff = np.where(diff > 180, diff - 360, diff)
+        return np.where(diff < -180, diff + 360, diff)
+
+    def _navigate(self, dt, mask, effect_multiplier):
+        target_speed = self.ai_base_speed
+        if effect_multiplier is not None:
+            target_speed = target_speed * effect_multiplier
+        np.copyto(self.ai_target_speed, target_speed, where=mask)
+
+        target = self.waypoints[self._rows, self.current_waypoint]
+        dx = target[:, 0] - self.x
+        dy = target[:, 1] - self.y
+
+        reached = mask & (dx * dx + dy * dy < self.waypoint_threshold_sq)
+        if reached.any():
+            self.current_waypoint[reached] = (self.current_waypoint[reached] + 1) % self.waypoint_count[reached]
+            target = self.waypoints[self._rows, self.current_waypoint]
+            dx = target[:, 0] - self.x
+            dy = target[:, 1] - self.y
+
+        if self.track is not None:
+            dx, dy = self._avoid_walls(mask, dx, dy)
+
+        target_angle = np.degrees(np.arctan2(dx, -dy))
+        angle_diff = self._wrap_degrees(target_angle - self.angle)
+        abs_diff = np.abs(angle_diff)
+
+        turn_amount = self.turn_speed * dt
+        np.copyto(self.angle, np.where(abs_diff < turn_amount, target_angle,
+                                       self.angle + np.sign(angle_diff) * turn_amount), where=mask)
+
+        speed = self.speed
+        friction = self.friction
+        speed = np.where(speed < target_speed,
+                         np.minimum(speed + self.acceleration * dt, target_speed),
+                         np.where(speed > target_speed,
+                                  np.maximum(speed - friction * dt, target_speed),
+                                  speed))
+
+        sharp_speed = target_speed * 0.2
+        sharp = (abs_diff > 45) & (speed > sharp_speed)
+        corner_speed = target_speed * 0.4
+        corner = (abs_diff <= 45) & (abs_diff > 25) & (speed > corner_speed)
+        if sharp.any():
+            speed = np.where(sharp, np.maximum(speed - self.brake_force * dt * 0.2, sharp_speed), speed)
+        if corner.any():
+            speed = np.where(corner, np.maximum(speed - friction * dt * 1.5, corner_speed), speed)
+
+        np.copyto(self.speed, speed, where=mask)
+
+    def _avoid_walls(self, mask, dx, dy):
+        avoid_distance = self.wall_avoid_distance
+        clearance = self.track.distances_to_wall(self.x, self.y)
+        near = mask & self.avoids_walls & (clearance < avoid_distance)
+        if not near.any():
+            return dx, dy
+
+        normal_x, normal_y = self.track.wall_normals(self.x, self.y)
+        length = np.sqrt(dx * dx + dy * dy)
+        length = np.where(length == 0, 1.0, length)
+        weight = (avoid_distance - clearance) / avoid_distance * self.wall_avoid_strength
+        return (np.where(near, dx / length + normal_x * weight, dx),
+                np.where(near, dy / length + normal_y * weight, dy))
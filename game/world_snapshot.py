@@ -0,0 +1,106 @@
+import threading
+
+from components.car import Car
+
+class CarState:
+    """Copy of the car attributes that rendering, the HUD and the minimap read."""
+
+    __slots__ = ('x', 'y', 'angle', 'previous_pose', 'speed', 'max_speed', 'color',
+                 'sprite_name', 'original_sprite', 'active_effects')
+
+    def __init__(self, car):
+        self.x = car.x
+        self.y = car.y
+        self.angle = car.angle
+        self.previous_pose = car.previous_pose
+        self.speed = car.speed
+        self.max_speed = car.max_speed
+        self.color = car.color
+        self.sprite_name = car.sprite_name
+        self.original_sprite = car.original_sprite
+        self.active_effects = tuple(dict(effect) for effect in car.active_effects)
+
+    interpolated_pose = Car.interpolated_pose
+    draw = Car.draw
+
+class RaceState:
+    """Copy of the race manager state read by the HUD and the overlays."""
+
+    __slots__ = ('finish_line', 'laps', 'current_lap_time', 'best_lap_time', 'standings',
+                 'race_started', 'race_finished', 'countdown_active', 'countdown_display',
+                 'lap_message_timer', 'race_results')
+
+    def __init__(self, race_manager, car_states):
+        self.finish_line = race_manager.finish_line
+        self.laps = race_manager.laps
+        self.current_lap_time = race_manager.current_lap_time
+        self.best_lap_time = race_manager.best_lap_time
+        self.standings = tuple(dict(entry, car=car_states[id(entry['car'])])
+                               for entry in race_manager.standings)
+        self.race_started = race_manager.race_started
+        self.race_finished = race_manager.is_race_finished()
+        self.countdown_active = race_manager.is_countdown_active()
+        self.countdown_display = race_manager.get_countdown_display() if self.countdown_active else None
+        self.lap_message_timer = race_manager.lap_message_timer
+        self.race_results = tuple(dict(result) for result in race_manager.race_results)
+
+    def is_countdown_active(self):
+        return self.countdown_active
+
+    def get_countdown_display(self):
+        return self.countdown_display
+
+    def is_race_finished(self):
+        return self.race_finished
+
+class WorldSnapshot:
+    """Everything a frame draws, captured after a simulation step.
+
+    Nothing in it is mutated by the live simulation, so a render thread can
+    draw it while the next steps run; active power-ups are referenced as-is
+    because drawing them reads only their position and fixed shape. time is when the last captured step
+    was due; render_alpha() turns the time since then into an interpolation
+    factor.
+    """
+
+    __slots__ = ('player', 'ai_cars', 'powerups', 'particles', 'race', 'camera', 'time')
+
+    def __init__(self, simulation, effect_manager, camera, time=0.0):
+        self.player = CarState(simulation.player_car)
+        self.ai_cars = tuple(CarState(car) for car in simulation.ai_cars)
+        car_states = {id(simulation.player_car): self.player}
+        car_states.update((id(car), state) for car, state in zip(simulation.ai_cars, self.ai_cars))
+
+        self.powerups = tuple(pu for pu in simulation.powerups if pu.active)
+        self.particles = effect_manager.snapshot() if effect_manager else None
+        self.race = RaceState(simulation.race_manager, car_states)
+        self.camera = camera.get_state()
+        self.time = time
+
+    def render_alpha(self, now, step):
+        return min(1.0, max(0.0, (now - self.time) / step))
+
+class SnapshotBuffer:
+    """Double buffer of world snapshots between the simulation and render threads.
+
+    The simulation writes into the back slot and swaps it to the front; the
+    renderer always reads the front slot, blocking only until the first
+    snapshot exists.
+    """
+
+    def __init__(self):
+        self._slots = [None, None]
+        self._front = 0
+        self._ready = threading.Condition()
+
+    def publish(self, snapshot):
+        back = 1 - self._front
+        self._slots[back] = snapshot
+        with self._ready:
+            self._front = back
+            self._ready.notify_all()
+
+    def latest(self, timeout=None):
+        with self._ready:
+            self._ready.wait_for(lambda: self._slots[self._front] is not None, timeout)
+            return self._slots[self._front]
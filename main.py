@@ -1,30 +1,49 @@
 import pygame
 import sys
+import time
+import queue
 import random
-import math
-from pathlib import Path
+import argparse
 
-from components.car import Car
 from components.track import Track
-from components.ai_car import AICar
 from components.hud import HUD 
 from components.effects import EffectManager
 from components.sound import SoundManager
-from components import powerup
+from components.overlay import OverlayRenderer
 from game.game_config import GameConfig
 from game.camera_controller import CameraController
-from game.race_manager import RaceManager
-from game.collision_manager import CollisionManager
+from game.simulation import RaceSimulation
+from game.profiler import FrameProfiler
+from game.dirty_rects import DirtyRectTracker
+from game.frame_pacer import FramePacer
+from game.sim_thread import SimulationThread
+from game.world_snapshot import WorldSnapshot
+from game.replay import ReplayWriter, ReplayPlayer, encode_keys, COMMAND_START
 
 pygame.init()
 
 class Game:
-    def __init__(self):
+    def __init__(self, profile_export=None, record_path=None, replay_path=None, replay_speed=1,
+                 dirty_rects=False, sim_rate=GameConfig.SIM_RATE, fps=GameConfig.FPS, threaded=False):
         self.screen = pygame.display.set_mode((GameConfig.SCREEN_WIDTH, GameConfig.SCREEN_HEIGHT))
         pygame.display.set_caption(GameConfig.TITLE)
         self.clock = pygame.time.Clock()
         self.running = True
-        self.dt = 0
+        self.fps = fps
+        self.threaded = threaded
+        self.pacer = FramePacer(sim_rate, max_steps=GameConfig.MAX_SIM_STEPS_PER_FRAME,
+                                target_fps=sim_rate if threaded else fps)
+        self.dt = self.pacer.step
+        self.keys = pygame.key.get_pressed()
+        self.commands = queue.SimpleQueue()
+
+        self.profiler = FrameProfiler()
+        self.profile_export = profile_export
+
+        self.dirty_rects = None
+        if dirty_rects:
+            self.dirty_rects = DirtyRectTracker(GameConfig.SCREEN_WIDTH, GameConfig.SCREEN_HEIGHT,
+                                                scroll_threshold=GameConfig.DIRTY_RECT_SCROLL_THRESHOLD)
 
         self.track = Track(GameConfig.SCREEN_WIDTH, GameConfig.SCREEN_HEIGHT)
         
@@ -33,17 +52,36 @@ class Game:
 
         self.sound_manager = SoundManager()
         self.effect_manager = EffectManager()
-        self.camera = CameraController(GameConfig.SCREEN_WIDTH, GameConfig.SCREEN_HEIGHT)
-        self.race_manager = RaceManager(GameConfig.MAX_LAPS, self.sound_manager)
-
-        self._load_spawn_positions()
+        self.camera_rng = random.Random()
+        self.camera = CameraController(GameConfig.SCREEN_WIDTH, GameConfig.SCREEN_HEIGHT,
+                                       rng=self.camera_rng)
+
+        self.replay = None
+        self.replay_speed = replay_speed
+        if replay_path:
+            self.replay = ReplayPlayer(replay_path, self.track, self.sound_manager,
+                                       self.effect_manager, profiler=self.profiler,
+                                       on_reset=self.camera_rng.seed)
+            self.simulation = self.replay.simulation
+        else:
+            self.simulation = RaceSimulation(
+                self.track, self.sound_manager, self.effect_manager, profiler=self.profiler
+            )
+        self.race_manager = self.simulation.race_manager
+        self.camera_rng.seed(self.simulation.seed)
 
-        self.collision_manager = CollisionManager(
-            self.track, self.effect_manager, self.sound_manager
-        )
+        self.recorder = None
+        self.pending_commands = 0
+        self.results_recorded = False
+        if record_path and not self.replay:
+            self.recorder = ReplayWriter(record_path, self.simulation)
 
         self.hud.generate_minimap(self.track)
-        self.powerups = powerup.spawn_powerups_on_track(self.track, num_hazards=8, num_boosts=5)
+        self.overlay = OverlayRenderer(
+            GameConfig.SCREEN_WIDTH, GameConfig.SCREEN_HEIGHT, GameConfig.MAX_LAPS,
+            white=GameConfig.WHITE, black=GameConfig.BLACK,
+            yellow=GameConfig.YELLOW, green=GameConfig.GREEN
+        )
 
         self.engine_sound_timer = random.uniform(
             GameConfig.ENGINE_SOUND_MIN_INTERVAL,
@@ -52,114 +90,40 @@ class Game:
 
         self.sound_manager.play_music()
 
-    def _load_spawn_positions(self):
-        spawn_data = GameConfig.load_spawn_positions()
-
-        player_data = spawn_data["player"]
-        self.player_car = Car(player_data["x"], player_data["y"], color=GameConfig.RED)
-
-        finish_data = spawn_data.get("finish_line")
-        if finish_data:
-            finish_line = [
-                (finish_data["x1"], finish_data["y1"]),
-                (finish_data["x2"], finish_data["y2"])
-            ]
-            self.race_manager.set_finish_line(finish_line)
-
-        racing_line = self.track.get_racing_line()
-        self.ai_cars = []
-
-        for ai_data in spawn_data.get("ai_cars", []):
-            ai_car = AICar(
-                ai_data["x"],
-                ai_data["y"],
-                racing_line,
-                color=tuple(ai_data["color"]),
-                ai_speed=ai_data["speed"],
-                racing_line_offset=ai_data["offset"],
-                sprite_name=ai_data.get("sprite", "bolid.png")
-            )
-            self.ai_cars.append(ai_car)
-
-        self._set_starting_angles()
-        self.race_manager.init_ai_lap_data(self.ai_cars)
-
-    def _set_starting_angles(self):
-        if not self.race_manager.finish_line:
-            self.player_car.angle = 0
-            for ai_car in self.ai_cars:
-                ai_car.angle = 0
-            return
-
-        x1, y1 = self.race_manager.finish_line[0]
-        x2, y2 = self.race_manager.finish_line[1]
-
-        dx = x2 - x1
-        dy = y2 - y1
-
-        line_angle_rad = math.atan2(dy, dx)
-        perp_angle_rad = line_angle_rad + math.pi / 2
-        perp_angle_deg = math.degrees(perp_angle_rad)
-        game_angle = 90 - perp_angle_deg
-        game_angle = game_angle % 360
-
-        racing_line = self.track.get_racing_line()
-        if racing_line and len(racing_line) > 0:
-            first_waypoint = racing_line[0]
-            wx, wy = first_waypoint
-
-            angle1 = game_angle
-            angle2 = (game_angle + 180) % 360
-
-            player_x, player_y = self.player_car.x, self.player_car.y
-
-            dx1 = wx - player_x
-            dy1 = wy - player_y
-            angle1_rad = math.radians(angle1)
-            forward1_x = math.sin(angle1_rad)
-            forward1_y = -math.cos(angle1_rad)
-            dot1 = dx1 * forward1_x + dy1 * forward1_y
-
-            angle2_rad = math.radians(angle2)
-            forward2_x = math.sin(angle2_rad)
-            forward2_y = -math.cos(angle2_rad)
-            dot2 = dx1 * forward2_x + dy1 * forward2_y
-
-            if dot2 > dot1:
-                game_angle = angle2
-
-        self.player_car.angle = game_angle
-        for ai_car in self.ai_cars:
-            ai_car.angle = game_angle
-
     def handle_events(self):
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 self.running = False
+            elif event.type == pygame.WINDOWEXPOSED and self.dirty_rects:
+                self.dirty_rects.invalidate()
             elif event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_ESCAPE:
                     self.running = False
-                elif event.key == pygame.K_SPACE:
-                    if self.race_manager.is_race_finished():
-                        self.reset_race()
-                    elif not self.race_manager.race_started and not self.race_manager.is_countdown_active():
-                        self.race_manager.start_countdown()
+                elif event.key == pygame.K_F3:
+                    self.profiler.toggle_overlay()
+                elif event.key == pygame.K_SPACE and not self.replay:
+                    self.commands.put(pygame.K_SPACE)
+
+    def _apply_commands(self):
+        while not self.commands.empty():
+            if self.commands.get() != pygame.K_SPACE:
+                continue
+            if self.race_manager.is_race_finished():
+                self.reset_race()
+            elif not self.race_manager.race_started and not self.race_manager.is_countdown_active():
+                self.race_manager.start_countdown()
+                self.pending_commands |= COMMAND_START
 
     def reset_race(self):
-        self.race_manager.reset()
-
-        self.player_car.speed = 0
-        self.player_car.stunned = False
-
-        for ai_car in self.ai_cars:
-            ai_car.speed = 0
-            ai_car.stunned = False
-
-        self._load_spawn_positions()
-        self.powerups = powerup.spawn_powerups_on_track(self.track, num_hazards=8, num_boosts=5)
+        self.simulation.reset()
+        self.pacer.reset()
+        self.camera_rng.seed(self.simulation.seed)
+        if self.recorder:
+            self.recorder.record_reset(self.simulation.seed)
+            self.results_recorded = False
 
     def update(self):
-        self.race_manager.update(self.dt, self.player_car, self.ai_cars)
+        self._apply_commands()
 
         self.engine_sound_timer -= self.dt
         if self.engine_sound_timer <= 0:
@@ -169,59 +133,103 @@ class Game:
                 GameConfig.ENGINE_SOUND_MAX_INTERVAL
             )
 
-        keys = pygame.key.get_pressed()
-        if self.race_manager.is_race_active():
-            self.player_car.handle_input(keys, self.dt)
-        self.player_car.update(self.dt)
-
-        for ai_car in self.ai_cars:
-            if self.race_manager.is_race_active():
-                ai_car.update(self.dt)
-
-        for pu in self.powerups:
-            pu.update(self.dt)
-
-        camera_shake = self.collision_manager.update(self.player_car, self.ai_cars, self.powerups)
+        simulation = self.simulation
+        simulation.player_car.store_pose()
+        for ai_car in simulation.ai_cars:
+            ai_car.store_pose()
+
+        if self.replay:
+            # The camera steps with every replayed tick, like it did while recording, but
+            # interpolates over the whole frame like the cars.
+            camera_start = self.camera.get_camera_position()
+            for _ in range(self.replay_speed):
+                self._update_camera(self.replay.step())
+            self.camera.prev_camera_x, self.camera.prev_camera_y = camera_start
+        else:
+            keys = self.keys
+            if self.recorder:
+                self.recorder.record_tick(self.dt, encode_keys(keys), self.pending_commands)
+            self.pending_commands = 0
+            camera_shake = self.simulation.step(self.dt, keys)
+
+            if self.recorder and self.race_manager.is_race_finished() and not self.results_recorded:
+                self.recorder.record_results(self.race_manager.race_results)
+                self.results_recorded = True
+
+            self._update_camera(camera_shake)
+
+    def _update_camera(self, camera_shake):
         if camera_shake > 0:
             self.camera.add_shake(camera_shake)
 
-        self.effect_manager.update(self.dt)
-        self.camera.update(self.player_car.x, self.player_car.y, self.dt)
-
-    def render(self):
-        camera_x, camera_y = self.camera.get_camera_offset()
-
-        self.track.draw(self.screen, camera_x, camera_y)
-
-        if self.race_manager.finish_line:
-            self._draw_finish_line(camera_x, camera_y)
-
-        for pu in self.powerups:
-            pu.draw(self.screen, camera_x, camera_y)
-
-        for ai_car in self.ai_cars:
-            ai_car.draw(self.screen, camera_x, camera_y)
-
-        self.player_car.draw(self.screen, camera_x, camera_y)
-
-        self.effect_manager.draw(self.screen, camera_x, camera_y)
+        with self.profiler.scope("camera"):
+            player_car = self.simulation.player_car
+            self.camera.update(player_car.x, player_car.y, self.dt)
+
+    def capture(self, timestamp=0.0):
+        return WorldSnapshot(self.simulation, self.effect_manager, self.camera, timestamp)
+
+    def render(self, snapshot=None, alpha=1.0):
+        if snapshot is None:
+            simulation = self.simulation
+            player, ai_cars, race = simulation.player_car, simulation.ai_cars, self.race_manager
+            powerups = [pu for pu in simulation.powerups if pu.active]
+            camera_state = None
+            particles = self.effect_manager.snapshot()
+        else:
+            player, ai_cars, race = snapshot.player, snapshot.ai_cars, snapshot.race
+            powerups = snapshot.powerups
+            camera_state = snapshot.camera
+            particles = snapshot.particles
+        profiler = self.profiler
+        camera_x, camera_y = self.camera.get_camera_offset(alpha, camera_state)
+        dirty = []
+
+        with profiler.scope("draw_track"):
+            self.track.draw(self.screen, camera_x, camera_y)
+
+            if race.finish_line:
+                dirty.append(self._draw_finish_line(race.finish_line, camera_x, camera_y))
+
+        with profiler.scope("draw_powerups"):
+            for pu in powerups:
+                dirty.append(pu.draw_shape(self.screen, camera_x, camera_y))
+
+        with profiler.scope("draw_cars"):
+            for ai_car in ai_cars:
+                dirty.append(ai_car.draw(self.screen, camera_x, camera_y, alpha))
+
+            dirty.append(player.draw(self.screen, camera_x, camera_y, alpha))
+
+        with profiler.scope("draw_effects"):
+            if particles is not None:
+                dirty.append(self.effect_manager.draw(self.screen, camera_x, camera_y, particles))
+
+        with profiler.scope("draw_hud"):
+            dirty += self.hud.draw(
+                self.screen,
+                player,
+                ai_cars,
+                race.laps,
+                race.current_lap_time,
+                race.best_lap_time,
+                race.standings
+            )
 
-        self.hud.draw(
-            self.screen,
-            self.player_car,
-            self.ai_cars,
-            self.race_manager.laps,
-            self.race_manager.current_lap_time,
-            self.race_manager.best_lap_time
-        )
+        with profiler.scope("draw_overlays"):
+            dirty += self.overlay.draw(self.screen, race)
 
-        self._draw_ui_overlays()
+        dirty.append(profiler.draw(self.screen))
 
-        pygame.display.flip()
+        with profiler.scope("flip"):
+            if self.dirty_rects:
+                self.dirty_rects.present((int(-camera_x), int(-camera_y)), dirty)
+            else:
+                pygame.display.flip()
 
-    def _draw_finish_line(self, camera_x, camera_y):
-        x1, y1 = self.race_manager.finish_line[0]
-        x2, y2 = self.race_manager.finish_line[1]
+    def _draw_finish_line(self, finish_line, camera_x, camera_y):
+        x1, y1 = finish_line[0]
+        x2, y2 = finish_line[1]
         screen_x1 = x1 - camera_x
         screen_y1 = y1 - camera_y
         screen_x2 = x2 - camera_x
@@ -232,119 +240,88 @@ class Game:
             max(screen_x1, screen_x2) > -margin and
             min(screen_y1, screen_y2) < GameConfig.SCREEN_HEIGHT + margin and
             max(screen_y1, screen_y2) > -margin):
-            pygame.draw.line(self.screen, GameConfig.WHITE,
-                             (screen_x1, screen_y1), (screen_x2, screen_y2), 10)
-
-    def _draw_ui_overlays(self):
-        large_font = pygame.font.Font(None, 72)
-
-        if self.race_manager.is_countdown_active():
-            countdown_text_str = self.race_manager.get_countdown_display()
-            color = GameConfig.YELLOW if countdown_text_str != "START!" else GameConfig.GREEN
-            countdown_text = large_font.render(countdown_text_str, True, color)
-            text_rect = countdown_text.get_rect(center=(GameConfig.SCREEN_WIDTH // 2,
-                                                         GameConfig.SCREEN_HEIGHT // 2))
-
-            shadow = large_font.render(countdown_text_str, True, GameConfig.BLACK)
-            shadow_rect = shadow.get_rect(center=(GameConfig.SCREEN_WIDTH // 2 + 3,
-                                                 GameConfig.SCREEN_HEIGHT // 2 + 3))
-            self.screen.blit(shadow, shadow_rect)
-            self.screen.blit(countdown_text, text_rect)
-
-        if (not self.race_manager.race_started and
-            not self.race_manager.is_countdown_active() and
-            not self.race_manager.is_race_finished()):
-            start_text = large_font.render("Kliknij SPACJE aby zacząć", True, GameConfig.YELLOW)
-            text_rect = start_text.get_rect(center=(GameConfig.SCREEN_WIDTH // 2,
-                                                     GameConfig.SCREEN_HEIGHT // 2))
-
-            padding = 20
-            box_rect = pygame.Rect(
-                text_rect.left - padding,
-                text_rect.top - padding,
-                text_rect.width + padding * 2,
-                text_rect.height + padding * 2
-            )
-            pygame.draw.rect(self.screen, GameConfig.BLACK, box_rect)
-            pygame.draw.rect(self.screen, GameConfig.YELLOW, box_rect, 3)
-            self.screen.blit(start_text, text_rect)
-
-        if self.race_manager.lap_message_timer > 0 and not self.race_manager.is_race_finished():
-            lap_msg = large_font.render(
-                f"OKRĄŻENIE {self.race_manager.laps}/{GameConfig.MAX_LAPS}",
-                True, GameConfig.WHITE
-            )
-            text_rect = lap_msg.get_rect(center=(GameConfig.SCREEN_WIDTH // 2,
-                                                 GameConfig.SCREEN_HEIGHT // 2))
-
-            shadow = large_font.render(
-                f"OKRĄŻENIE {self.race_manager.laps}/{GameConfig.MAX_LAPS}",
-                True, GameConfig.BLACK
-            )
-            shadow_rect = shadow.get_rect(center=(GameConfig.SCREEN_WIDTH // 2 + 3,
-                                                   GameConfig.SCREEN_HEIGHT // 2 + 3))
-            self.screen.blit(shadow, shadow_rect)
-            self.screen.blit(lap_msg, text_rect)
-
-        if self.race_manager.is_race_finished():
-            self._draw_race_results()
-
-    def _draw_race_results(self):
-        overlay = pygame.Surface((GameConfig.SCREEN_WIDTH, GameConfig.SCREEN_HEIGHT),
-                                 pygame.SRCALPHA)
-        overlay.fill((0, 0, 0, 180))
-        self.screen.blit(overlay, (0, 0))
-
-        title_font = pygame.font.Font(None, 96)
-        title_text = title_font.render("KONIEC!", True, GameConfig.YELLOW)
-        title_rect = title_text.get_rect(center=(GameConfig.SCREEN_WIDTH // 2, 100))
-        self.screen.blit(title_text, title_rect)
-
-        medium_font = pygame.font.Font(None, 48)
-        y_offset = 220
-
-        medal_colors = {
-            1: (255, 215, 0),
-            2: (192, 192, 192),
-            3: (205, 127, 50)
-        }
-
-        for result in self.race_manager.race_results:
-            position = result['position']
-            name = result['name']
-            time = result['finish_time']
-
-            if position in medal_colors:
-                color = medal_colors[position]
-            else:
-                color = GameConfig.WHITE
-
-            result_text = f"{position}. {name:12s} - {time:.2f}s"
-            text_surface = medium_font.render(result_text, True, color)
-            text_rect = text_surface.get_rect(center=(GameConfig.SCREEN_WIDTH // 2, y_offset))
-            self.screen.blit(text_surface, text_rect)
-
-            y_offset += 70
-
-        restart_font = pygame.font.Font(None, 42)
-        restart_text = restart_font.render("Kliknij SPACJE aby zagrać jeszcze raz",
-                                           True, GameConfig.GREEN)
-        restart_rect = restart_text.get_rect(center=(GameConfig.SCREEN_WIDTH // 2,
-                                                     GameConfig.SCREEN_HEIGHT - 80))
-        self.screen.blit(restart_text, restart_rect)
+            return pygame.draw.line(self.screen, GameConfig.WHITE,
+                                    (screen_x1, screen_y1), (screen_x2, screen_y2), 10)
+        return None
 
     def run(self):
-        while self.running:
-            self.handle_events()
-            self.update()
-            self.render()
-            self.dt = self.clock.tick(GameConfig.FPS) / 1000.0
+        if self.threaded:
+            self._run_threaded()
+        else:
+            self.clock.tick()
+            while self.running:
+                steps = self.pacer.advance(self.clock.tick(self.fps) / 1000.0)
+                self.profiler.begin_frame()
+                self.handle_events()
+                self.keys = pygame.key.get_pressed()
+                with self.profiler.scope("update"):
+                    for _ in range(steps):
+                        self.update()
+                with self.profiler.scope("render"):
+                    self.render(alpha=self.pacer.alpha)
+                self.profiler.end_frame()
+
+        if self.profile_export:
+            self.profiler.export(self.profile_export)
+        stats = self.pacer.stats()
+        if stats['late_frames'] or stats['dropped_frames']:
+            print(f"Klatki: {stats['frames']}, spóźnione: {stats['late_frames']}, "
+                  f"z pominiętą symulacją: {stats['dropped_frames']} "
+                  f"({stats['dropped_steps']} kroków)")
+        if self.dirty_rects:
+            stats = self.dirty_rects.stats()
+            frames = stats['full_frames'] + stats['partial_frames']
+            print(f"Częściowe odświeżanie: {stats['partial_frames']}/{frames} klatek, "
+                  f"przesłano {stats['pushed_fraction']:.0%} pikseli")
+        if self.recorder:
+            self.recorder.close()
 
         pygame.quit()
         sys.exit()
 
+    def _run_threaded(self):
+        worker = SimulationThread(self)
+        worker.start()
+        try:
+            while self.running and worker.error is None:
+                self.clock.tick(self.fps)
+                self.profiler.begin_frame()
+                self.handle_events()
+                self.keys = pygame.key.get_pressed()
+                snapshot = worker.buffer.latest(timeout=1.0)
+                if snapshot is not None:
+                    with self.profiler.scope("render"):
+                        self.render(snapshot, snapshot.render_alpha(time.perf_counter(), self.pacer.step))
+                self.profiler.end_frame()
+        finally:
+            worker.stop()
+            worker.join()
+
+        if worker.error is not None:
+            raise worker.error
+
 def main():
-    game = Game()
+    parser = argparse.ArgumentParser(description=GameConfig.TITLE)
+    parser.add_argument("--profile-export", metavar="PLIK",
+                        help="zapisz statystyki czasu klatki (.json lub .csv) przy wyjściu")
+    parser.add_argument("--record", metavar="PLIK", help="nagraj powtórkę wyścigu do pliku")
+    parser.add_argument("--replay", metavar="PLIK", help="odtwórz nagraną powtórkę")
+    parser.add_argument("--replay-speed", type=int, default=1, metavar="N",
+                        help="odtwarzaj powtórkę N razy szybciej")
+    parser.add_argument("--sim-rate", type=int, default=GameConfig.SIM_RATE, metavar="HZ",
+                        help="stała częstotliwość kroków symulacji")
+    parser.add_argument("--fps", type=int, default=GameConfig.FPS,
+                        help="limit klatek renderowania na sekundę")
+    parser.add_argument("--threaded", action="store_true",
+                        help="uruchom symulację w osobnym wątku, a renderowanie w głównym")
+    parser.add_argument("--dirty-rects", action="store_true",
+                        help="odświeżaj tylko zmienione fragmenty ekranu zamiast całej klatki")
+    args = parser.parse_args()
+
+    game = Game(profile_export=args.profile_export, record_path=args.record,
+                replay_path=args.replay, replay_speed=args.replay_speed,
+                dirty_rects=args.dirty_rects, sim_rate=args.sim_rate, fps=args.fps,
+                threaded=args.threaded)
     game.run()
 
 if __name__ == "__main__":
@@ -0,0 +1,111 @@
+import argparse
+import sys
+import time
+from pathlib import Path
+
+from components.track import Track
+from game import batch_runner
+from game.game_config import GameConfig
+from game.simulation import RaceSimulation
+from game.replay import ReplayPlayer, record_headless_race
+
+def _parse_list(value, cast):
+    return [cast(item) for item in value.split(",") if item.strip()]
+
+def run_single(args):
+    track = Track(GameConfig.SCREEN_WIDTH, GameConfig.SCREEN_HEIGHT)
+    simulation = RaceSimulation(track, seed=args.seed, player_autopilot=True, physics=args.physics,
+                                track_collision=args.collision)
+    if args.record:
+        stats = record_headless_race(simulation, args.record, args.dt, args.max_time)
+    else:
+        stats = simulation.run_until_finished(args.dt, args.max_time)
+
+    if not stats['finished']:
+        print(f"Wyścig nie zakończył się w ciągu {args.max_time:.0f}s symulacji.")
+
+    for result in stats['results']:
+        print(f"{result['position']}. {result['name']:12s} - {result['finish_time']:.2f}s")
+
+    print(f"Symulacja: {stats['sim_time']:.1f}s w {stats['wall_time']:.2f}s "
+          f"({stats['sim_speed']:.1f} s symulacji / s), {stats['ticks']} kroków")
+
+def run_replay(args):
+    track = Track(GameConfig.SCREEN_WIDTH, GameConfig.SCREEN_HEIGHT)
+    stats = ReplayPlayer(args.replay, track).run()
+
+    for result in stats['results']:
+        print(f"{result['position']}. {result['name']:12s} - {result['finish_time']:.2f}s")
+
+    if stats['recorded_results'] is None:
+        print("Powtórka nie zawiera zapisanych wyników.")
+    elif stats['verified']:
+        print("Wyniki zgodne z nagraniem.")
+    else:
+        print("Wyniki RÓŻNIĄ SIĘ od nagrania!")
+
+    print(f"Powtórka: {stats['sim_time']:.1f}s w {stats['replay_wall_time']:.2f}s, {stats['ticks']} kroków")
+    return stats['verified']
+
+def run_batch(args):
+    spawn_files = args.spawn or [None]
+    spawn_variants = []
+    for spawn_file in spawn_files:
+        name = Path(spawn_file).stem if spawn_file else "spawn_positions"
+        spawn_variants.append((name, GameConfig.load_spawn_positions(spawn_file)))
+
+    first_seed = args.seed if args.seed is not None else 0
+    seeds = list(range(first_seed, first_seed + args.races))
+    configs = batch_runner.build_configs(
+        spawn_variants, seeds,
+        speeds=_parse_list(args.speeds, int) if args.speeds else None,
+        offsets=_parse_list(args.offsets, int) if args.offsets else None,
+        tune_indices=_parse_list(args.tune, int) if args.tune else None,
+        dt=args.dt, max_sim_time=args.max_time, physics=args.physics,
+        track_collision=args.collision
+    )
+
+    start = time.perf_counter()
+    results = batch_runner.run_batch(configs, processes=args.processes)
+    elapsed = time.perf_counter() - start
+
+    print(batch_runner.format_summary(batch_runner.summarize(results)))
+    sim_time = sum(race['sim_time'] for race in results)
+    unfinished = sum(1 for race in results if not race['finished'])
+    print(f"{len(results)} wyścigów, {sim_time:.0f}s symulacji w {elapsed:.1f}s"
+          + (f", nieukończone: {unfinished}" if unfinished else ""))
+
+def main():
+    parser = argparse.ArgumentParser(description="Symulacja wyścigu bez okna, dźwięku i renderowania.")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--dt", type=float, default=1.0 / GameConfig.SIM_RATE)
+    parser.add_argument("--max-time", type=float, default=600.0)
+    parser.add_argument("--physics", choices=("scalar", "vector"), default="scalar",
+                        help="vector: fizyka wszystkich aut naraz w tablicach NumPy "
+                             "(szybsza dopiero przy kilkudziesięciu autach)")
+    parser.add_argument("--collision", choices=("point", "sweep", "slide"), default="point",
+                        help="kolizje z torem: sweep sprawdza całą drogę auta w kroku, "
+                             "slide dodatkowo ślizga auto wzdłuż bandy zamiast ogłuszać")
+    parser.add_argument("--batch", action="store_true",
+                        help="uruchom wiele wyścigów równolegle i wypisz podsumowanie")
+    parser.add_argument("--races", type=int, default=4, help="liczba ziaren na konfigurację")
+    parser.add_argument("--spawn", nargs="*", help="warianty pliku spawn_positions.json")
+    parser.add_argument("--speeds", help="lista prędkości AI, np. 390,410,430")
+    parser.add_argument("--offsets", help="lista przesunięć linii jazdy AI, np. -50,0,50")
+    parser.add_argument("--tune", help="indeksy strojonych aut AI (od 0), domyślnie wszystkie")
+    parser.add_argument("--processes", type=int, default=None)
+    parser.add_argument("--record", metavar="PLIK", help="nagraj powtórkę wyścigu do pliku")
+    parser.add_argument("--replay", metavar="PLIK",
+                        help="odtwórz powtórkę bez okna i sprawdź zgodność wyników")
+    args = parser.parse_args()
+
+    if args.replay:
+        if not run_replay(args):
+            sys.exit(1)
+    elif args.batch:
+        run_batch(args)
+    else:
+        run_single(args)
+
+if __name__ == "__main__":
+    main()